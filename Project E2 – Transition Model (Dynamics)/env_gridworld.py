@@ -14,11 +14,17 @@ It represents the actual world whose dynamics the agent must learn.
 
 This separation allows us to compare:
 predicted transitions vs real outcomes.
+
+snapshot() / restore() make "what would really happen" queries cheap: the
+grid is shared, agent state is a tuple, and cell edits go through
+set_cell(), which journals them for undo.
 """
 
 from __future__ import annotations
-from dataclasses import dataclass
-from typing import List, Tuple, Dict
+from dataclasses import dataclass, field
+from typing import List, Tuple, Dict, Union
+
+from action_space import ActionSpace, DEFAULT_ACTION_SPACE
 
 Pos = Tuple[int, int]
 
@@ -36,9 +42,16 @@ class GridworldEnv:
 
     agent_pos:
         Current true position of the agent.
+
+    action_space:
+        Registry mapping action names / integer ids to (dx, dy).
     """
     grid: List[List[str]]
     agent_pos: Pos
+    action_space: ActionSpace = DEFAULT_ACTION_SPACE
+    _journal: List[Tuple[Pos, str]] = field(default_factory=list, init=False, repr=False)
+    _journaling: bool = field(default=False, init=False, repr=False)
+    _epoch: int = field(default=0, init=False, repr=False)
 
     @property
     def size(self) -> Tuple[int, int]:
@@ -47,9 +60,9 @@ class GridworldEnv:
         w = len(self.grid[0]) if h else 0
         return (w, h)
 
-    def step(self, action: str) -> Tuple[Pos, Dict[str, float]]:
+    def step(self, action: Union[str, int]) -> Tuple[Pos, Dict[str, float]]:
         """
-        Applies an action to the environment.
+        Applies an action (name or integer id) to the environment.
 
         This function encodes the *true* transition dynamics:
         - boundary constraints
@@ -65,20 +78,7 @@ class GridworldEnv:
         It only updates the real world.
         """
         x, y = self.agent_pos
-        dx, dy = 0, 0
-
-        if action == "up":
-            dy = -1
-        elif action == "down":
-            dy = 1
-        elif action == "left":
-            dx = -1
-        elif action == "right":
-            dx = 1
-        elif action == "stay":
-            dx, dy = 0, 0
-        else:
-            raise ValueError(f"Unknown action: {action}")
+        dx, dy = self.action_space.delta(action)
 
         nx, ny = x + dx, y + dy
         w, h = self.size
@@ -97,3 +97,50 @@ class GridworldEnv:
         reward = 1.0 if self.grid[ny][nx] == "G" else 0.0
 
         return self.agent_pos, {"reward": reward}
+
+    def set_cell(self, pos: Pos, value: str) -> None:
+        """
+        Changes one grid cell (e.g. a door opening). Once snapshot() has
+        been called, the old value is journaled so restore() can undo it;
+        commit() ends journaling.
+
+        The grid list is edited in place: envs that call set_cell must not
+        share a grid (e.g. [grid] * 3), or each edit changes all of them.
+        """
+        x, y = pos
+        if self._journaling:
+            self._journal.append((pos, self.grid[y][x]))
+        self.grid[y][x] = value
+
+    def snapshot(self) -> Tuple[Pos, int, int]:
+        """
+        O(1) token for the current state. The grid is shared, not copied.
+        Tokens carry the commit epoch, so restore() rejects stale ones.
+        """
+        self._journaling = True
+        return (self.agent_pos, len(self._journal), self._epoch)
+
+    def commit(self) -> None:
+        """
+        Keeps the current grid and drops the undo journal, so long-running
+        edits (e.g. a toggling door) do not accumulate. Tokens taken before
+        the commit can no longer be restored.
+        """
+        self._journal.clear()
+        self._journaling = False
+        self._epoch += 1
+
+    def restore(self, token: Tuple[Pos, int, int]) -> None:
+        """
+        Returns to a snapshot, undoing cell changes made since.
+
+        Snapshots nest like a stack: restoring an older token invalidates
+        tokens taken after it.
+        """
+        pos, n, epoch = token
+        if epoch != self._epoch or n > len(self._journal):
+            raise ValueError("Snapshot token predates commit()")
+        while len(self._journal) > n:
+            (x, y), old = self._journal.pop()
+            self.grid[y][x] = old
+        self.agent_pos = pos
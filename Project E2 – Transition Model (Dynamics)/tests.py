@@ -11,6 +11,9 @@ These tests verify the core invariants of the transition system:
    - after observing a transition once, it should produce a non-null prediction
    - confidence should be > 0 for the seen (state, action) pair
 
+3) Environment snapshots should restore agent state and undo cell edits
+   without copying the grid, and commit() should drop the undo journal.
+
 These are intentionally lightweight.
 They exist to prevent regressions as the project evolves.
 """
@@ -82,8 +85,46 @@ def test_tabular_model_learns() -> None:
     assert conf > 0.0, "Confidence should be > 0 for seen transitions"
 
 
+def test_env_snapshot_restore() -> None:
+    """
+    restore() should return to the snapshot, undoing set_cell edits.
+    """
+    grid = [list("..."), list(".#."), list("..G")]
+    env = GridworldEnv(grid=grid, agent_pos=(0, 0))
+
+    token = env.snapshot()
+    env.step("right")
+    env.set_cell((1, 1), ".")
+    env.step("down")
+    assert env.agent_pos == (1, 1)
+
+    env.restore(token)
+    assert env.agent_pos == (0, 0) and env.grid is grid and grid[1][1] == "#"
+    assert env.step("right")[0] == (1, 0) and env.step("down")[0] == (1, 0)
+
+    # without an outstanding snapshot, or after commit(), nothing is journaled
+    fresh = GridworldEnv(grid=[list(".#")], agent_pos=(0, 0))
+    for _ in range(10):
+        fresh.set_cell((1, 0), "." if fresh.grid[0][1] == "#" else "#")
+    assert not fresh._journal
+    stale = fresh.snapshot()
+    fresh.set_cell((1, 0), ".")
+    fresh.commit()
+    assert not fresh._journal and fresh.grid[0][1] == "."
+
+    # a token from before commit() is rejected even if the journal regrew
+    fresh.snapshot()
+    fresh.set_cell((1, 0), "#")
+    try:
+        fresh.restore(stale)
+        assert False
+    except ValueError:
+        pass
+
+
 if __name__ == "__main__":
     test_rule_based_transition_moves()
     test_rule_based_transition_obstacle_blocks()
     test_tabular_model_learns()
+    test_env_snapshot_restore()
     print("✅ tests passed")
@@ -17,18 +17,17 @@ from action_schema import Action
 from constraints import validate_move
 from cost_models import unit_cost, stay_cost
 from risk_models import no_risk, small_slip_risk
+from action_masks import ActionLegalityMask
+from action_space import ACTIONS, DEFAULT_ACTION_SPACE
 
 Pos = Tuple[int, int]
 
 
+MOVE_DELTAS: Dict[str, Tuple[int, int]] = dict(zip(ACTIONS, DEFAULT_ACTION_SPACE.deltas))
+
+
 def _delta(name: str) -> Tuple[int, int]:
-    return {
-        "up": (0, -1),
-        "down": (0, 1),
-        "left": (-1, 0),
-        "right": (1, 0),
-        "stay": (0, 0),
-    }[name]
+    return DEFAULT_ACTION_SPACE.delta(name)
 
 
 def _proposed_pos(ws: SimpleWorldState, action_name: str) -> Pos:
@@ -37,9 +36,12 @@ def _proposed_pos(ws: SimpleWorldState, action_name: str) -> Pos:
     return (x + dx, y + dy)
 
 
-def make_action(action_name: str) -> Action:
+def make_action(action_name: str, *, cost=None, risk=None) -> Action:
     """
     Factory for movement actions.
+
+    cost / risk override the default models, e.g. with terrain_cost or
+    terrain_slip_risk.
     """
 
     def precondition(ws: SimpleWorldState):
@@ -50,8 +52,8 @@ def make_action(action_name: str) -> Action:
     def effect(ws: SimpleWorldState) -> Dict[str, Any]:
         return {"proposed_next_pos": _proposed_pos(ws, action_name)}
 
-    cost_fn = stay_cost if action_name == "stay" else unit_cost
-    risk_fn = no_risk if action_name == "stay" else small_slip_risk
+    cost_fn = cost or (stay_cost if action_name == "stay" else unit_cost)
+    risk_fn = risk or (no_risk if action_name == "stay" else small_slip_risk)
 
     return Action(
         name=action_name,
@@ -64,4 +66,11 @@ def make_action(action_name: str) -> Action:
 
 
 def default_actions() -> List[Action]:
-    return [make_action(a) for a in ["up", "down", "left", "right", "stay"]]
+    return [make_action(a) for a in ACTIONS]
+
+
+def compile_legality_mask(ws: SimpleWorldState, actions: List[Action]) -> ActionLegalityMask:
+    """
+    Compiles the movement preconditions of `actions` into a legality mask.
+    """
+    return ActionLegalityMask(ws, [a.name for a in actions], MOVE_DELTAS)
@@ -0,0 +1,103 @@
+"""
+Action Legality Masks (Compiled Constraint Checks)
+
+allowed_actions evaluates every Action's precondition closure per state,
+and each movement precondition goes through validate_move, allocating a
+ConstraintResult per call.
+
+For movement actions, legality only depends on:
+- the grid bounds
+- whether the target cell is a known obstacle
+
+So it can be compiled once from the belief map into a boolean mask:
+
+    legal[y, x, a] = action a is allowed from cell (x, y)
+
+When perception reveals new cells, only the cells that can move INTO them
+need recomputing, so updates cost O(revealed cells * n_actions) rather than
+a full rebuild. Legality checks during planning become an array lookup.
+
+Like the constraints themselves, masks are computed from belief only.
+"""
+
+from __future__ import annotations
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+from state_adapter import SimpleWorldState
+
+Pos = Tuple[int, int]
+
+
+class ActionLegalityMask:
+    """
+    Boolean legality mask [H, W, n_actions] derived from a belief map.
+
+    action_names fixes the action axis order.
+    deltas maps each action name to its (dx, dy) movement.
+    Zero-movement actions (e.g. "stay") are always legal, as in make_action.
+    """
+
+    def __init__(self, ws: SimpleWorldState, action_names: List[str], deltas: Dict[str, Tuple[int, int]]):
+        self.action_names = list(action_names)
+        self.index = {name: i for i, name in enumerate(self.action_names)}
+        self.deltas = [deltas[name] for name in self.action_names]
+        self.grid_size = ws.grid_size
+        self.rebuild(ws)
+
+    def rebuild(self, ws: SimpleWorldState) -> None:
+        """
+        Recomputes the full mask from the belief map (vectorized).
+        """
+        w, h = ws.grid_size
+        self.blocked = np.array(
+            [[cell == "obstacle" for cell in row] for row in ws.known_map],
+            dtype=bool,
+        ).reshape(h, w)
+        self.legal = np.zeros((h, w, len(self.action_names)), dtype=bool)
+
+        for a, (dx, dy) in enumerate(self.deltas):
+            if dx == 0 and dy == 0:
+                self.legal[:, :, a] = True
+                continue
+            # source cells whose target (x+dx, y+dy) lies inside the grid
+            ys = slice(max(0, -dy), h - max(0, dy))
+            xs = slice(max(0, -dx), w - max(0, dx))
+            ts_y = slice(max(0, dy), h - max(0, -dy))
+            ts_x = slice(max(0, dx), w - max(0, -dx))
+            self.legal[ys, xs, a] = ~self.blocked[ts_y, ts_x]
+
+    def update_revealed(self, ws: SimpleWorldState, cells: Iterable[Pos]) -> None:
+        """
+        Incrementally refreshes the mask after perception revealed `cells`.
+
+        Only sources that move into a revealed cell are touched.
+        """
+        w, h = self.grid_size
+        for (x, y) in cells:
+            blocked = ws.known_map[y][x] == "obstacle"
+            if blocked == self.blocked[y, x]:
+                continue
+            self.blocked[y, x] = blocked
+            for a, (dx, dy) in enumerate(self.deltas):
+                if dx == 0 and dy == 0:
+                    continue
+                sx, sy = x - dx, y - dy
+                if 0 <= sx < w and 0 <= sy < h:
+                    self.legal[sy, sx, a] = not blocked
+
+    def is_legal(self, pos: Pos, action_name: str) -> bool:
+        """
+        Array lookup replacing precondition(ws) for movement actions.
+        """
+        x, y = pos
+        return bool(self.legal[y, x, self.index[action_name]])
+
+    def legal_names(self, pos: Pos) -> List[str]:
+        """
+        Names of all legal actions from pos.
+        """
+        x, y = pos
+        row = self.legal[y, x]
+        return [name for i, name in enumerate(self.action_names) if row[i]]
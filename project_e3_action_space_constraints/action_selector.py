@@ -3,14 +3,30 @@ Action Selection Utilities
 
 This module evaluates available actions and selects candidates
 based on constraints, cost, and risk.
+
+If a compiled ActionLegalityMask is passed, legality comes from an array
+lookup instead of each action's precondition closure; preconditions are
+only consulted to explain why an action is illegal.
+
+If compiled ActionTables are passed, candidates are scored from the
+cost/risk tensors and only the winner is materialized as an AllowedAction.
+
+rank_actions returns the k best candidates via a heap. RankedActionCache
+memoizes those rankings per (position, local belief neighbourhood), so a
+planner revisiting states re-ranks only where the belief map changed.
 """
 
 from __future__ import annotations
-from dataclasses import dataclass
-from typing import List, Dict, Any, Optional
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Optional, Tuple
+import heapq
+
+import numpy as np
 
 from state_adapter import SimpleWorldState
 from action_schema import Action
+from action_masks import ActionLegalityMask
+from action_tables import ActionTables, TIME_WEIGHT, ENERGY_WEIGHT, RISK_WEIGHT
 
 
 @dataclass
@@ -23,26 +39,167 @@ class AllowedAction:
     effect: Dict[str, Any]
 
 
-def allowed_actions(ws: SimpleWorldState, actions: List[Action]) -> List[AllowedAction]:
+def _check(ws: SimpleWorldState, a: Action, mask: Optional[ActionLegalityMask], *, explain: bool = True):
+    """
+    Returns (ok, reason), using the mask when it covers the action.
+
+    With explain=False, illegal masked actions skip the precondition call
+    and get an empty reason.
+    """
+    if mask is not None and a.name in mask.index:
+        if mask.is_legal(ws.agent_pos, a.name):
+            return True, ""
+        if not explain:
+            return False, ""
+        _, reason = a.precondition(ws)
+        return False, reason
+    ok, reason = a.precondition(ws)
+    return ok, reason
+
+
+def allowed_actions(
+    ws: SimpleWorldState,
+    actions: List[Action],
+    mask: Optional[ActionLegalityMask] = None,
+) -> List[AllowedAction]:
     """
     Evaluates all actions and returns their validity and metadata.
     """
     out: List[AllowedAction] = []
     for a in actions:
-        ok, reason = a.precondition(ws)
+        ok, reason = _check(ws, a, mask)
         out.append(AllowedAction(a, ok, reason, a.cost(ws), a.risk(ws), a.effect(ws)))
     return out
 
 
-def pick_low_cost(ws: SimpleWorldState, actions: List[Action]) -> Optional[AllowedAction]:
+def score_allowed(a: AllowedAction) -> float:
+    """
+    Heuristic score used for ranking (lower is better).
+    """
+    return (
+        TIME_WEIGHT * a.cost["time"]
+        + ENERGY_WEIGHT * a.cost["energy"]
+        + RISK_WEIGHT * a.risk["failure_prob"]
+    )
+
+
+def pick_low_cost(
+    ws: SimpleWorldState,
+    actions: List[Action],
+    mask: Optional[ActionLegalityMask] = None,
+    tables: Optional[ActionTables] = None,
+) -> Optional[AllowedAction]:
     """
     Simple heuristic action selector.
+
+    With a mask, illegal actions are filtered before any cost, risk or
+    effect function is called. With tables, scores come from one array
+    lookup and no per-candidate dicts are built.
     """
-    candidates = [a for a in allowed_actions(ws, actions) if a.ok]
+    if tables is not None:
+        x, y = ws.agent_pos
+        scores = tables.score[y, x, [tables.index[a.name] for a in actions]].copy()
+        for i, a in enumerate(actions):
+            if not _check(ws, a, mask, explain=False)[0]:
+                scores[i] = np.inf
+        if not len(actions) or not np.isfinite(scores.min()):
+            return None
+        best = actions[int(np.argmin(scores))]
+        return AllowedAction(best, True, "", best.cost(ws), best.risk(ws), best.effect(ws))
+
+    if mask is not None:
+        candidates = [
+            AllowedAction(a, True, "", a.cost(ws), a.risk(ws), a.effect(ws))
+            for a in actions
+            if _check(ws, a, mask, explain=False)[0]
+        ]
+    else:
+        candidates = [a for a in allowed_actions(ws, actions) if a.ok]
     if not candidates:
         return None
 
-    def score(a: AllowedAction) -> float:
-        return a.cost["time"] + 10 * a.cost["energy"] + 5 * a.risk["failure_prob"]
+    return min(candidates, key=score_allowed)
+
+
+def rank_actions(
+    ws: SimpleWorldState,
+    actions: List[Action],
+    k: int,
+    mask: Optional[ActionLegalityMask] = None,
+) -> List[AllowedAction]:
+    """
+    The k lowest-scoring legal actions, best first.
+
+    Uses a bounded heap (O(n log k)). Ties keep the input order, so
+    rank_actions(ws, actions, 1)[0] is what pick_low_cost returns.
+    """
+    candidates = [
+        AllowedAction(a, True, "", a.cost(ws), a.risk(ws), a.effect(ws))
+        for a in actions
+        if _check(ws, a, mask, explain=False)[0]
+    ]
+    return heapq.nsmallest(k, candidates, key=score_allowed)
+
+
+def neighbourhood_key(ws: SimpleWorldState, radius: int = 1) -> Tuple[str, ...]:
+    """
+    Belief cells within `radius` of the agent (out-of-bounds as "").
+
+    Legality of unit moves only depends on these cells.
+    """
+    x0, y0 = ws.agent_pos
+    w, h = ws.grid_size
+    return tuple(
+        ws.known_map[y][x] if 0 <= x < w and 0 <= y < h else ""
+        for y in range(y0 - radius, y0 + radius + 1)
+        for x in range(x0 - radius, x0 + radius + 1)
+    )
+
+
+@dataclass
+class RankedActionCache:
+    """
+    Memoized top-k rankings keyed by (position, local neighbourhood).
+
+    One entry is kept per position; when its stored neighbourhood no longer
+    matches the belief map, the entry is recomputed. invalidate_revealed()
+    drops entries eagerly after perception.
+
+    radius must cover the furthest cell any action's precondition, cost or
+    risk inspects (1 for unit moves).
+    """
+    actions: List[Action]
+    radius: int = 1
+    mask: Optional[ActionLegalityMask] = None
+    entries: Dict[Tuple[int, int], Tuple[Tuple[str, ...], int, List[AllowedAction]]] = field(default_factory=dict)
+    hits: int = 0
+    misses: int = 0
+
+    def top_k(self, ws: SimpleWorldState, k: int) -> List[AllowedAction]:
+        """
+        Cached rank_actions(ws, self.actions, k, self.mask).
+        """
+        pos = ws.agent_pos
+        nb = neighbourhood_key(ws, self.radius)
+        entry = self.entries.get(pos)
+        if entry is not None:
+            enb, ek, ranked = entry
+            # a shorter list than requested means every legal action is in it
+            if enb == nb and (k <= ek or len(ranked) < ek):
+                self.hits += 1
+                return ranked[:k]
+
+        self.misses += 1
+        ranked = rank_actions(ws, self.actions, k, self.mask)
+        self.entries[pos] = (nb, k, ranked)
+        return list(ranked)
 
-    return min(candidates, key=score)
+    def invalidate_revealed(self, cells) -> None:
+        """
+        Drops entries whose neighbourhood contains any of `cells`.
+        """
+        r = self.radius
+        for (cx, cy) in cells:
+            for y in range(cy - r, cy + r + 1):
+                for x in range(cx - r, cx + r + 1):
+                    self.entries.pop((x, y), None)
@@ -0,0 +1,99 @@
+"""
+Action Cost/Risk Tables (Array Forms for Batch Scoring)
+
+Each Action carries scalar cost(ws) / risk(ws) functions returning fresh
+dicts. Scoring many candidates that way allocates a dict per candidate.
+
+This module tabulates them once per belief snapshot:
+
+    time[y, x, a], energy[y, x, a], failure_prob[y, x, a]
+
+and the selector's heuristic score
+
+    score = time + 10 * energy + 5 * failure_prob
+
+so batches of (position, action) candidates, or whole candidate
+trajectories, are scored with array indexing.
+
+Cost/risk functions that expose `.array(grid_size)` (see cost_models and
+risk_models) are tabulated directly. Others are evaluated once per cell.
+"""
+
+from __future__ import annotations
+from dataclasses import dataclass, replace
+from typing import Dict, List
+
+import numpy as np
+
+from state_adapter import SimpleWorldState
+from action_schema import Action
+
+TIME_WEIGHT = 1.0
+ENERGY_WEIGHT = 10.0
+RISK_WEIGHT = 5.0
+
+
+@dataclass
+class ActionTables:
+    """
+    Per-cell, per-action cost and risk tensors [H, W, n_actions].
+    """
+    action_names: List[str]
+    time: np.ndarray
+    energy: np.ndarray
+    failure_prob: np.ndarray
+
+    def __post_init__(self):
+        self.index: Dict[str, int] = {n: i for i, n in enumerate(self.action_names)}
+        self.score = (
+            TIME_WEIGHT * self.time
+            + ENERGY_WEIGHT * self.energy
+            + RISK_WEIGHT * self.failure_prob
+        )
+
+    def score_batch(self, xs, ys, action_ids) -> np.ndarray:
+        """
+        Scores N (x, y, action_id) candidates in one indexing call.
+        """
+        return self.score[np.asarray(ys), np.asarray(xs), np.asarray(action_ids)]
+
+    def score_trajectories(self, xs, ys, action_ids, valid=None) -> np.ndarray:
+        """
+        Total cost of N candidate trajectories of length T.
+
+        xs, ys, action_ids: [N, T] positions each action is taken from.
+        valid: optional [N, T] bool; steps after truncation contribute 0.
+        """
+        s = self.score_batch(xs, ys, action_ids)
+        if valid is not None:
+            s = np.where(valid, s, 0.0)
+        return s.sum(axis=-1)
+
+
+def _tabulate(ws: SimpleWorldState, fn, field_names: List[str]) -> Dict[str, np.ndarray]:
+    array = getattr(fn, "array", None)
+    if array is not None:
+        return array(ws.grid_size)
+
+    w, h = ws.grid_size
+    out = {name: np.zeros((h, w)) for name in field_names}
+    for y in range(h):
+        for x in range(w):
+            vals = fn(replace(ws, agent_pos=(x, y)))
+            for name in field_names:
+                out[name][y, x] = float(vals.get(name, 0.0))
+    return out
+
+
+def compile_action_tables(ws: SimpleWorldState, actions: List[Action]) -> ActionTables:
+    """
+    Tabulates cost and risk of every action from every cell.
+    """
+    costs = [_tabulate(ws, a.cost, ["time", "energy"]) for a in actions]
+    risks = [_tabulate(ws, a.risk, ["failure_prob"]) for a in actions]
+    return ActionTables(
+        action_names=[a.name for a in actions],
+        time=np.stack([c["time"] for c in costs], axis=-1),
+        energy=np.stack([c["energy"] for c in costs], axis=-1),
+        failure_prob=np.stack([r["failure_prob"] for r in risks], axis=-1),
+    )
@@ -6,11 +6,21 @@ a proposed action is allowed in a given belief state.
 
 Constraints operate ONLY on the agent's belief, not ground truth.
 This reflects real-world decision-making under uncertainty.
+
+Two paths are provided:
+- scalar checks (in_bounds, not_known_obstacle, validate_move) that return
+  a ConstraintResult per position
+- a declarative ConstraintRegistry whose constraints are compiled against
+  a belief state into vectorized predicates; checking N candidate positions
+  is one call returning a uint8 reason-code array (0 = ok), so a registry
+  holds at most MAX_CONSTRAINTS constraints
 """
 
 from __future__ import annotations
-from dataclasses import dataclass
-from typing import Tuple
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
 
 from state_adapter import SimpleWorldState
 
@@ -57,3 +67,132 @@ def validate_move(ws: SimpleWorldState, pos: Pos) -> ConstraintResult:
     if not r.ok:
         return r
     return not_known_obstacle(ws, pos)
+
+
+# --- Compiled (vectorized) constraints -------------------------------------
+
+OK = 0
+
+REASON_DTYPE = np.uint8
+MAX_CONSTRAINTS = int(np.iinfo(REASON_DTYPE).max)
+
+BELIEF_CODES: Dict[str, int] = {"unknown": 0, "empty": 1, "obstacle": 2, "goal": 3}
+
+
+@dataclass
+class CompiledBelief:
+    """
+    Array view of a belief state, shared by all compiled predicates.
+
+    cells[y, x] holds BELIEF_CODES values.
+    """
+    width: int
+    height: int
+    cells: np.ndarray
+
+    @classmethod
+    def from_state(cls, ws: SimpleWorldState) -> "CompiledBelief":
+        w, h = ws.grid_size
+        cells = np.array(
+            [[BELIEF_CODES.get(c, 0) for c in row] for row in ws.known_map],
+            dtype=np.int8,
+        ).reshape(h, w)
+        return cls(width=w, height=h, cells=cells)
+
+
+# predicate(belief, xs, ys) -> bool array, True where the constraint holds.
+# It only ever receives positions that passed every earlier constraint.
+VectorPredicate = Callable[[CompiledBelief, np.ndarray, np.ndarray], np.ndarray]
+
+
+def in_bounds_vec(belief: CompiledBelief, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+    return (xs >= 0) & (xs < belief.width) & (ys >= 0) & (ys < belief.height)
+
+
+def not_known_obstacle_vec(belief: CompiledBelief, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+    return belief.cells[ys, xs] != BELIEF_CODES["obstacle"]
+
+
+@dataclass
+class ConstraintRegistry:
+    """
+    Ordered set of named hard constraints with stable reason codes.
+
+    Constraints are evaluated in registration order; a position reports the
+    code of the first constraint it fails. Codes start at 1 (0 means ok).
+
+    Every registry starts with "out_of_bounds" (code 1), so registered
+    predicates may index the belief grid directly: they only ever see
+    in-bounds positions.
+    """
+    names: List[str] = field(default_factory=list)
+    predicates: List[VectorPredicate] = field(default_factory=list)
+
+    def __post_init__(self):
+        if not self.names:
+            self.register("out_of_bounds", in_bounds_vec)
+        elif self.predicates[0] is not in_bounds_vec:
+            raise ValueError("The first constraint must be out_of_bounds")
+
+    def register(self, reason: str, predicate: VectorPredicate) -> int:
+        """
+        Adds a constraint and returns its reason code.
+        """
+        if reason in self.names:
+            raise ValueError(f"Constraint already registered: {reason}")
+        if len(self.names) >= MAX_CONSTRAINTS:
+            raise ValueError(f"Too many constraints (max {MAX_CONSTRAINTS})")
+        self.names.append(reason)
+        self.predicates.append(predicate)
+        return len(self.names)
+
+    def reason(self, code: int) -> str:
+        """
+        Maps a reason code back to its string ("" for OK).
+        """
+        return "" if code == OK else self.names[code - 1]
+
+    def compile(self, ws: SimpleWorldState) -> "CompiledConstraints":
+        return CompiledConstraints(self, CompiledBelief.from_state(ws))
+
+
+@dataclass
+class CompiledConstraints:
+    """
+    A registry bound to one belief snapshot.
+    """
+    registry: ConstraintRegistry
+    belief: CompiledBelief
+
+    def check(self, positions) -> np.ndarray:
+        """
+        Checks a batch of candidate positions.
+
+        positions: array-like of shape [N, 2] with (x, y) rows.
+        Returns a uint8 array [N] of reason codes (0 = allowed).
+        """
+        pos = np.asarray(positions, dtype=np.int64).reshape(-1, 2)
+        codes = np.zeros(len(pos), dtype=REASON_DTYPE)
+        live = np.arange(len(pos))
+        for code, pred in enumerate(self.registry.predicates, start=1):
+            if live.size == 0:
+                break
+            ok = pred(self.belief, pos[live, 0], pos[live, 1])
+            codes[live[~ok]] = code
+            live = live[ok]
+        return codes
+
+    def check_moves(self, origins, deltas) -> np.ndarray:
+        """
+        Checks origin + delta targets; both broadcast to [N, 2].
+        """
+        return self.check(np.asarray(origins) + np.asarray(deltas))
+
+
+def default_registry() -> ConstraintRegistry:
+    """
+    The movement constraints of validate_move, in the same order.
+    """
+    reg = ConstraintRegistry()
+    reg.register("blocked_by_known_obstacle", not_known_obstacle_vec)
+    return reg
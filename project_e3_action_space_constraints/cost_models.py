@@ -3,13 +3,30 @@ Cost Models (Action Resource Usage)
 
 This module defines simple cost functions attached to actions.
 Costs are soft signals used for ranking and trade-offs.
+
+Array forms:
+    A cost function may carry an `.array(grid_size)` attribute returning
+    {"time": [H, W], "energy": [H, W]}: the cost of taking the action from
+    every cell. Planners tabulate these once (see action_tables.
+    compile_action_tables) and score whole batches without calling the
+    scalar function or allocating a dict per candidate.
 """
 
 from __future__ import annotations
-from typing import Dict
+from typing import Dict, Tuple
+
+import numpy as np
+
 from state_adapter import SimpleWorldState
 
 
+def _constant_cost_array(time: float, energy: float):
+    def array(grid_size: Tuple[int, int]) -> Dict[str, np.ndarray]:
+        w, h = grid_size
+        return {"time": np.full((h, w), time), "energy": np.full((h, w), energy)}
+    return array
+
+
 def unit_cost(ws: SimpleWorldState) -> Dict[str, float]:
     """
     Standard movement cost.
@@ -22,3 +39,30 @@ def stay_cost(ws: SimpleWorldState) -> Dict[str, float]:
     Lower energy cost for staying in place.
     """
     return {"time": 1.0, "energy": 0.005}
+
+
+unit_cost.array = _constant_cost_array(1.0, 0.01)
+stay_cost.array = _constant_cost_array(1.0, 0.005)
+
+
+def terrain_cost(energy_map, *, time: float = 1.0, base_energy: float = 0.01):
+    """
+    Factory for terrain-dependent movement cost.
+
+    energy_map[y][x] multiplies base_energy for actions taken from (x, y)
+    (e.g. 1.0 on floor, 3.0 in mud).
+
+    The returned function has both the scalar and the array form.
+    """
+    energy = np.asarray(energy_map, dtype=np.float64) * base_energy
+
+    def cost(ws: SimpleWorldState) -> Dict[str, float]:
+        x, y = ws.agent_pos
+        return {"time": time, "energy": float(energy[y, x])}
+
+    def array(grid_size: Tuple[int, int]) -> Dict[str, np.ndarray]:
+        w, h = grid_size
+        return {"time": np.full((h, w), time), "energy": energy.reshape(h, w).copy()}
+
+    cost.array = array
+    return cost
@@ -3,13 +3,27 @@ Risk Models (Action Failure Probability)
 
 This module defines simple risk estimators for actions.
 Risks are probabilistic and influence planning but do not block actions.
+
+Array forms:
+    Like cost models, a risk function may carry `.array(grid_size)`
+    returning {"failure_prob": [H, W]} for tabulation by planners.
 """
 
 from __future__ import annotations
-from typing import Dict
+from typing import Dict, Tuple
+
+import numpy as np
+
 from state_adapter import SimpleWorldState
 
 
+def _constant_risk_array(p: float):
+    def array(grid_size: Tuple[int, int]) -> Dict[str, np.ndarray]:
+        w, h = grid_size
+        return {"failure_prob": np.full((h, w), p)}
+    return array
+
+
 def no_risk(ws: SimpleWorldState) -> Dict[str, float]:
     return {"failure_prob": 0.0}
 
@@ -20,3 +34,27 @@ def small_slip_risk(ws: SimpleWorldState) -> Dict[str, float]:
     Later this can depend on terrain, uncertainty, or history.
     """
     return {"failure_prob": 0.05}
+
+
+no_risk.array = _constant_risk_array(0.0)
+small_slip_risk.array = _constant_risk_array(0.05)
+
+
+def terrain_slip_risk(slip_map):
+    """
+    Factory for terrain-dependent failure probability.
+
+    slip_map[y][x] is the failure probability of acting from (x, y).
+    """
+    prob = np.clip(np.asarray(slip_map, dtype=np.float64), 0.0, 1.0)
+
+    def risk(ws: SimpleWorldState) -> Dict[str, float]:
+        x, y = ws.agent_pos
+        return {"failure_prob": float(prob[y, x])}
+
+    def array(grid_size: Tuple[int, int]) -> Dict[str, np.ndarray]:
+        w, h = grid_size
+        return {"failure_prob": prob.reshape(h, w).copy()}
+
+    risk.array = array
+    return risk
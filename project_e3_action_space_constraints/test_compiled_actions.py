@@ -0,0 +1,182 @@
+"""
+Sanity Tests for Project E3 (Compiled Action Structures)
+
+These tests cover the array-backed fast paths and check that they agree
+with the per-call Python checks they replace:
+
+1) Compiled legality masks should agree with action preconditions,
+   including after incremental updates from newly revealed cells.
+
+2) The compiled constraint registry should report the same failure reasons
+   as validate_move, run user-registered constraints behind the bounds
+   check, and refuse more constraints than the reason-code dtype can hold.
+
+3) Tabulated cost/risk scoring should pick the same action as the
+   dict-based selector, including for terrain-dependent models.
+
+4) Top-k ranking should agree with pick_low_cost, and cached rankings
+   should be recomputed once the local belief changes.
+
+They import only E3 modules, so they run on their own.
+"""
+
+from __future__ import annotations
+
+from state_adapter import (
+    SimpleWorldState,
+    init_known_map,
+    visible_window,
+    update_known_from_truth,
+)
+from action_library import default_actions, compile_legality_mask
+from constraints import (
+    validate_move,
+    default_registry,
+    not_known_obstacle_vec,
+    ConstraintRegistry,
+    BELIEF_CODES,
+    MAX_CONSTRAINTS,
+)
+from action_library import make_action
+from action_tables import compile_action_tables
+from action_selector import pick_low_cost, rank_actions, RankedActionCache
+from cost_models import terrain_cost
+from risk_models import terrain_slip_risk
+
+
+def test_legality_mask_matches_preconditions() -> None:
+    """
+    Mask lookups should equal precondition results for every cell and action,
+    before and after new obstacles are revealed.
+    """
+    truth = [list("..#"), list("#.."), list("...")]
+    known = init_known_map((3, 3))
+    update_known_from_truth(known, truth, visible_window((0, 0), (3, 3), radius=0))
+    ws = SimpleWorldState(grid_size=(3, 3), agent_pos=(0, 0), known_map=known, timestep=0)
+
+    actions = default_actions()
+    mask = compile_legality_mask(ws, actions)
+
+    def agrees() -> bool:
+        for y in range(3):
+            for x in range(3):
+                ws.agent_pos = (x, y)
+                for a in actions:
+                    ok, _ = a.precondition(ws)
+                    if bool(ok) != mask.is_legal((x, y), a.name):
+                        return False
+        return True
+
+    assert agrees()
+
+    revealed = visible_window((1, 1), (3, 3), radius=1)
+    update_known_from_truth(ws.known_map, truth, revealed)
+    mask.update_revealed(ws, revealed)
+    assert agrees()
+    assert mask.legal_names((1, 0)) == ["down", "left", "stay"]
+
+
+def test_compiled_constraints_match_validate_move() -> None:
+    """
+    Vectorized reason codes should map back to validate_move's reasons.
+    """
+    known = init_known_map((3, 2))
+    known[0][1] = "obstacle"
+    known[1][2] = "goal"
+    ws = SimpleWorldState(grid_size=(3, 2), agent_pos=(0, 0), known_map=known, timestep=0)
+
+    reg = default_registry()
+    no_goal = reg.register("goal_forbidden", lambda b, xs, ys: b.cells[ys, xs] != BELIEF_CODES["goal"])
+    compiled = reg.compile(ws)
+
+    candidates = [(x, y) for y in range(-1, 3) for x in range(-1, 4)]
+    codes = compiled.check(candidates)
+
+    for pos, code in zip(candidates, codes):
+        expected = validate_move(ws, pos)
+        if pos == (2, 1):
+            assert code == no_goal
+        else:
+            assert reg.reason(int(code)) == expected.reason
+
+    # predicates that index the grid never see out-of-bounds positions
+    reg = ConstraintRegistry()
+    reg.register("blocked_by_known_obstacle", not_known_obstacle_vec)
+    codes = reg.compile(ws).check([(-1, 0), (3, 1), (0, -5), (1, 0), (0, 0)])
+    assert codes.tolist() == [1, 1, 1, 2, 0]
+
+    # codes stay positive up to the dtype bound; registering past it raises
+    reg = ConstraintRegistry()
+    for i in range(MAX_CONSTRAINTS - 1):
+        last = reg.register(f"c{i}", lambda b, xs, ys: xs >= 0)
+    assert last == MAX_CONSTRAINTS
+    reg.predicates[-1] = lambda b, xs, ys: xs < 0
+    assert reg.compile(ws).check([(0, 0)])[0] == MAX_CONSTRAINTS
+    try:
+        reg.register("one_too_many", lambda b, xs, ys: xs >= 0)
+        assert False
+    except ValueError:
+        pass
+
+
+def test_action_tables_match_dict_scoring() -> None:
+    """
+    pick_low_cost with tables should agree with the dict-based path.
+    """
+    known = init_known_map((3, 3))
+    known[1][2] = "obstacle"
+    ws = SimpleWorldState(grid_size=(3, 3), agent_pos=(1, 1), known_map=known, timestep=0)
+
+    mud = terrain_cost([[1.0, 3.0, 1.0], [1.0, 1.0, 9.0], [1.0, 0.0, 1.0]])
+    ice = terrain_slip_risk([[0.0, 0.2, 0.0], [0.0, 0.0, 0.5], [0.3, 0.0, 0.0]])
+    actions = [make_action("up", cost=mud, risk=ice)] + default_actions()[1:]
+    tables = compile_action_tables(ws, actions)
+    mask = compile_legality_mask(ws, actions)
+
+    for pos in [(0, 0), (1, 0), (1, 1), (2, 2), (1, 2), (0, 2)]:
+        ws.agent_pos = pos
+        ref = pick_low_cost(ws, actions)
+        fast = pick_low_cost(ws, actions, mask=mask, tables=tables)
+        assert fast.action.name == ref.action.name
+        assert fast.cost == ref.cost and fast.risk == ref.risk
+
+    # "up" pays the mud and ice of the cell it is taken from
+    xs, ys, ids = [[0, 0]], [[2, 1]], [[0, 4]]
+    total = tables.score_trajectories(xs, ys, ids)
+    assert abs(total[0] - ((1.0 + 0.1 + 1.5) + (1.0 + 0.05))) < 1e-9
+    assert abs(tables.score[1, 2, 0] - (1.0 + 0.9 + 2.5)) < 1e-9
+
+
+def test_ranked_actions_and_cache():
+    """
+    rank_actions / RankedActionCache should agree with pick_low_cost.
+    """
+    known = init_known_map((3, 3))
+    ws = SimpleWorldState(grid_size=(3, 3), agent_pos=(1, 1), known_map=known, timestep=0)
+    actions = default_actions()
+
+    ranked = rank_actions(ws, actions, 3)
+    assert len(ranked) == 3
+    assert ranked[0].action.name == pick_low_cost(ws, actions).action.name == "stay"
+    assert len(rank_actions(ws, actions, 10)) == 5
+
+    cache = RankedActionCache(actions)
+    first = cache.top_k(ws, 5)
+    assert [a.action.name for a in cache.top_k(ws, 2)] == [a.action.name for a in first[:2]]
+    assert cache.hits == 1 and cache.misses == 1
+
+    # revealing an obstacle next to the agent changes the neighbourhood
+    known[1][2] = "obstacle"
+    names = [a.action.name for a in cache.top_k(ws, 5)]
+    assert "right" not in names and cache.misses == 2
+
+    cache.invalidate_revealed([(2, 1)])
+    assert (1, 1) not in cache.entries
+
+
+if __name__ == "__main__":
+    test_legality_mask_matches_preconditions()
+    test_compiled_constraints_match_validate_move()
+    test_action_tables_match_dict_scoring()
+    test_ranked_actions_and_cache()
+    print("✅ tests passed")
@@ -15,9 +15,10 @@ simple, general, explainable, and a strong baseline.
 
 import random
 from rollout import rollout
+from action_tables import compile_action_tables
 
 
-def choose_action(ws, actions, horizon=5, samples=50):
+def choose_action(ws, actions, horizon=5, samples=50, tables=None):
     """
     Chooses an action by evaluating imagined futures.
 
@@ -30,6 +31,9 @@ def choose_action(ws, actions, horizon=5, samples=50):
             Number of steps to simulate per candidate sequence.
         samples:
             Number of candidate sequences to evaluate.
+        tables:
+            Optional ActionTables for ws. Compiled here when omitted, so all
+            samples share one cost/risk tabulation.
 
     Returns:
         (best_action_name, best_score)
@@ -42,10 +46,12 @@ def choose_action(ws, actions, horizon=5, samples=50):
     best_action = None
 
     action_names = list(actions.keys())
+    if tables is None:
+        tables = compile_action_tables(ws, list(actions.values()))
 
     for _ in range(samples):
         seq = [random.choice(action_names) for _ in range(horizon)]
-        score = rollout(ws, seq, actions)
+        score = rollout(ws, seq, actions, tables)
 
         if score > best_score:
             best_score = score
@@ -16,9 +16,10 @@ This is the heart of Project E4: thinking-before-acting.
 
 from state_adapter import clone_state
 from transition_model import predict_next_state
+from action_tables import RISK_WEIGHT
 
 
-def rollout(start_state, action_seq, actions_map):
+def rollout(start_state, action_seq, actions_map, tables=None):
     """
     Simulates an action sequence from start_state.
 
@@ -29,6 +30,10 @@ def rollout(start_state, action_seq, actions_map):
             A list of action names (strings) to simulate.
         actions_map:
             Dict[str, Action] mapping action name -> Action object.
+        tables:
+            Optional ActionTables compiled from actions_map for this belief.
+            Each step is then charged with one array lookup instead of
+            calling action.cost / action.risk.
 
     Returns:
         score (float):
@@ -40,13 +45,15 @@ def rollout(start_state, action_seq, actions_map):
     Notes:
         - Rollouts stop early if an action is invalid (precondition fails).
         - Rollouts stop early if a goal is believed achieved (reward > 0).
-        - Costs and risks come from action definitions (E3 concepts reused).
+        - Costs and risks come from action definitions (E3 concepts reused),
+          or from tables compiled from them.
     """
     ws = clone_state(start_state)
 
     total_reward = 0.0
     total_cost = 0.0
     total_risk = 0.0
+    total_penalty = 0.0
 
     for a_name in action_seq:
         action = actions_map[a_name]
@@ -58,12 +65,15 @@ def rollout(start_state, action_seq, actions_map):
 
         next_ws, reward = predict_next_state(ws, a_name)
 
-        cost = action.cost(ws)
-        risk = action.risk(ws)
-
         total_reward += float(reward)
-        total_cost += float(cost.get("time", 0.0)) + float(cost.get("energy", 0.0))
-        total_risk += float(risk.get("failure_prob", 0.0))
+        if tables is not None:
+            x, y = ws.agent_pos
+            total_penalty += tables.score[y, x, tables.index[a_name]]
+        else:
+            cost = action.cost(ws)
+            risk = action.risk(ws)
+            total_cost += float(cost.get("time", 0.0)) + float(cost.get("energy", 0.0))
+            total_risk += float(risk.get("failure_prob", 0.0))
 
         ws = next_ws
 
@@ -71,5 +81,5 @@ def rollout(start_state, action_seq, actions_map):
         if reward > 0:
             break
 
-    score = total_reward - total_cost - 5.0 * total_risk
+    score = total_reward - total_cost - RISK_WEIGHT * total_risk - float(total_penalty)
     return score
@@ -14,9 +14,14 @@ while reality may still surprise it later.
 """
 
 from state_adapter import SimpleWorldState
+from action_space import ActionLike, ActionSpace, DEFAULT_ACTION_SPACE
 
 
-def predict_next_state(ws: SimpleWorldState, action: str):
+def predict_next_state(
+    ws: SimpleWorldState,
+    action: ActionLike,
+    space: ActionSpace = DEFAULT_ACTION_SPACE,
+):
     """
     Predicts the next belief state given a belief state and an action.
 
@@ -30,20 +35,7 @@ def predict_next_state(ws: SimpleWorldState, action: str):
     It acts as the agent's internal physics model.
     """
     x, y = ws.agent_pos
-    dx, dy = 0, 0
-
-    if action == "up":
-        dy = -1
-    elif action == "down":
-        dy = 1
-    elif action == "left":
-        dx = -1
-    elif action == "right":
-        dx = 1
-    elif action == "stay":
-        pass
-    else:
-        raise ValueError(f"Unknown action: {action}")
+    dx, dy = space.delta(action)
 
     nx, ny = x + dx, y + dy
     w, h = ws.grid_size
@@ -15,9 +15,14 @@ signals are easy to interpret.
 """
 
 from state_adapter import SimpleWorldState
+from action_space import ActionLike, ActionSpace, DEFAULT_ACTION_SPACE
 
 
-def predict_next_state(ws: SimpleWorldState, action: str):
+def predict_next_state(
+    ws: SimpleWorldState,
+    action: ActionLike,
+    space: ActionSpace = DEFAULT_ACTION_SPACE,
+):
     """
     Predicts next belief state and a belief-based reward signal.
 
@@ -28,20 +33,7 @@ def predict_next_state(ws: SimpleWorldState, action: str):
         "reward": 1.0 if next position is believed to be a goal, else 0.0
     """
     x, y = ws.agent_pos
-    dx, dy = 0, 0
-
-    if action == "up":
-        dy = -1
-    elif action == "down":
-        dy = 1
-    elif action == "left":
-        dx = -1
-    elif action == "right":
-        dx = 1
-    elif action == "stay":
-        pass
-    else:
-        raise ValueError(f"Unknown action: {action}")
+    dx, dy = space.delta(action)
 
     nx, ny = x + dx, y + dy
     w, h = ws.grid_size
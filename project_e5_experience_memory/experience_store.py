@@ -10,12 +10,18 @@ Experiences are indexed by:
 This allows the agent to later ask:
 - Has this action failed from this state before?
 - How surprising is this transition historically?
+
+An optional SpatialExperienceIndex can be attached to answer regional
+questions (rectangles, radii) without scanning by_key, and an optional
+RecencyIndex answers windowed / recency-weighted surprise queries.
 """
 
 from dataclasses import dataclass, field
-from typing import Dict, List, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 
 from experience import Experience
+from spatial_index import SpatialExperienceIndex
+from recency_index import RecencyIndex
 
 Pos = Tuple[int, int]
 Key = Tuple[Pos, str]  # (state_pos, action)
@@ -30,8 +36,15 @@ class ExperienceStore:
         (state_pos, action) -> list of Experience records
 
     This structure intentionally favors interpretability over compression.
+
+    spatial:
+        optional region index, kept in sync on every add()
+    recency:
+        optional time-aware index, kept in sync on every add()
     """
     by_key: Dict[Key, List[Experience]] = field(default_factory=dict)
+    spatial: Optional[SpatialExperienceIndex] = None
+    recency: Optional[RecencyIndex] = None
 
     def add(self, exp: Experience) -> None:
         """
@@ -39,6 +52,17 @@ class ExperienceStore:
         """
         key = (exp.state_pos, exp.action)
         self.by_key.setdefault(key, []).append(exp)
+        if self.spatial is not None:
+            self.spatial.add(exp)
+        if self.recency is not None:
+            self.recency.add(exp)
+
+    def add_many(self, exps: Iterable[Experience]) -> None:
+        """
+        Adds a batch of experiences to memory.
+        """
+        for exp in exps:
+            self.add(exp)
 
     def get(self, state_pos: Pos, action: str) -> List[Experience]:
         """
@@ -0,0 +1,299 @@
+"""
+Streaming Pipeline (Predict → Execute → Learn, in Micro-Batches)
+
+The E5/E6 demos run one serial loop per transition:
+    predict → execute → error → store → update model
+
+Every stage pays its per-call overhead on every single step.
+
+This module turns that loop into a reusable stream:
+- a generator source yields transitions from execute_in_reality
+- downstream stages are batch functions (List[item] -> List[item])
+- stages are connected by bounded buffers
+- each stage runs once per micro-batch instead of once per transition
+
+Backpressure:
+    Buffers are bounded. Stages are scheduled on virtual per-stage clocks
+    (measured call times), as if each ran on its own worker; a producer
+    whose output buffer has no room for another batch waits for its
+    consumer, which is counted as a stall. A slow stage shows up as a full
+    input buffer (max_depth == capacity) and stalls upstream of it.
+
+Per-stage counters (items, batches, seconds, peak buffer depth, stalls) make
+the bottleneck visible without a profiler.
+
+Note:
+    Learning lags execution by the items in flight (at most one buffer
+    per stage), because the source may run ahead of slower stages.
+"""
+
+import time
+from collections import deque
+from itertools import islice
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Tuple
+
+from experience import Experience
+from error_metrics import position_error
+
+Pos = Tuple[int, int]
+BatchFn = Callable[[List[Any]], List[Any]]
+
+
+@dataclass(frozen=True)
+class Transition:
+    """
+    One executed step, before any error computation.
+    """
+    t: int
+    state_pos: Pos
+    action: str
+    predicted_next_pos: Pos
+    actual_next_pos: Pos
+    info: Dict[str, float]
+
+
+@dataclass
+class StageStats:
+    """
+    Throughput counters for a single stage.
+
+    Fields:
+        items:     items consumed
+        batches:   batch calls made
+        seconds:   wall time spent inside the stage function
+        max_depth: peak occupancy of the stage's input buffer
+        stalls:    times this stage's output buffer was full (backpressure)
+    """
+    name: str
+    items: int = 0
+    batches: int = 0
+    seconds: float = 0.0
+    max_depth: int = 0
+    stalls: int = 0
+
+    def throughput(self) -> float:
+        """
+        Items processed per second of stage time.
+        """
+        if self.seconds <= 0.0:
+            return float("inf") if self.items else 0.0
+        return self.items / self.seconds
+
+
+@dataclass
+class Stage:
+    """
+    A named batch transformation.
+
+    fn receives a list of items and returns the list passed downstream.
+    """
+    name: str
+    fn: BatchFn
+
+
+@dataclass
+class StreamingPipeline:
+    """
+    Runs a source iterator through a chain of batch stages.
+
+    batch_size:
+        items per stage call
+    capacity:
+        maximum items held in any inter-stage buffer (>= batch_size)
+
+    Stages are scheduled as if each ran on its own worker: every actor
+    (source or stage) has a virtual clock that advances by the measured
+    time of its calls, and the actor that can start earliest runs next
+    (downstream first on ties). A producer may only start a batch when
+    its output buffer has room for one; otherwise it waits for the
+    consumer, which counts as one stall. A slow stage therefore fills its
+    input buffer to capacity and stalls the stages feeding it.
+    """
+    stages: List[Stage]
+    batch_size: int = 32
+    capacity: int = 128
+    stats: Dict[str, StageStats] = field(default_factory=dict)
+
+    def __post_init__(self):
+        if self.batch_size < 1:
+            raise ValueError("batch_size must be >= 1")
+        self.capacity = max(self.capacity, self.batch_size)
+        self.stats = {"source": StageStats("source")}
+        for st in self.stages:
+            self.stats[st.name] = StageStats(st.name)
+        # buffer i feeds stage i; entries are (ready_time, item)
+        self._buffers = [deque() for _ in self.stages]
+
+    def _batch_len(self, a: int, no_more: bool) -> int:
+        """
+        Items stage actor a (>= 1) would consume now: a full batch, or a
+        partial one once the producer is done or cannot add a batch.
+        """
+        buf = self._buffers[a - 1]
+        if len(buf) >= self.batch_size:
+            return self.batch_size
+        return len(buf) if no_more else 0
+
+    def run(self, source: Iterable[Any]) -> Dict[str, StageStats]:
+        """
+        Consumes the whole source and flushes every stage.
+
+        Returns the per-stage stats.
+        """
+        n = len(self.stages)
+        actors = [self.stats["source"]] + [self.stats[st.name] for st in self.stages]
+        free = [0.0] * (n + 1)  # virtual time each actor becomes idle
+        blocked = [False] * (n + 1)
+        it = iter(source)
+        exhausted = False
+
+        while True:
+            best, best_start, best_k = -1, float("inf"), 0
+            waiting = []
+            full = [len(buf) + self.batch_size > self.capacity for buf in self._buffers]
+            idle = exhausted
+            for a in range(n + 1):
+                if a == 0:
+                    k, ready = (0 if exhausted else self.batch_size), 0.0
+                else:
+                    # a full buffer is consumed even if short of a batch
+                    k = self._batch_len(a, idle or full[a - 1])
+                    ready = self._buffers[a - 1][k - 1][0] if k else 0.0
+                    idle = idle and not self._buffers[a - 1]
+                if k == 0:
+                    continue
+                start = max(free[a], ready)
+                if a < n and full[a]:
+                    waiting.append((a, start))
+                elif start <= best_start:
+                    best, best_start, best_k = a, start, k
+
+            if best < 0:
+                break
+            # producers that would have run by now but have no room wait
+            for a, start in waiting:
+                if start <= best_start and not blocked[a]:
+                    blocked[a] = True
+                    actors[a].stalls += 1
+
+            st = actors[best]
+            t0 = time.perf_counter()
+            if best == 0:
+                out = list(islice(it, self.batch_size))
+                exhausted = len(out) < self.batch_size
+            else:
+                buf = self._buffers[best - 1]
+                batch = [buf.popleft()[1] for _ in range(best_k)]
+                if blocked[best - 1]:
+                    # room freed: the producer resumes no earlier than now
+                    blocked[best - 1] = False
+                    free[best - 1] = max(free[best - 1], best_start)
+                out = self.stages[best - 1].fn(batch)
+            dt = time.perf_counter() - t0
+            free[best] = best_start + dt
+            st.seconds += dt
+            if out or best > 0:
+                st.items += len(out) if best == 0 else best_k
+                st.batches += 1
+
+            if out and best < n:
+                buf = self._buffers[best]
+                buf.extend((free[best], item) for item in out)
+                nxt = actors[best + 1]
+                nxt.max_depth = max(nxt.max_depth, len(buf))
+
+        return self.stats
+
+    def bottleneck(self) -> str:
+        """
+        Name of the stage with the most accumulated time.
+        """
+        return max(self.stats.values(), key=lambda s: s.seconds).name
+
+
+def reality_stream(
+    env,
+    ws,
+    actions: Iterable[str],
+    predict_fn: Callable[[Any, str], Pos],
+    *,
+    perception_radius: int = 1,
+    stop_on_reward: bool = True,
+) -> Iterator[Transition]:
+    """
+    Source stage: predicts, then executes each action in reality.
+
+    predict_fn(ws, action) returns the predicted next position. It is
+    evaluated before execution, against the current belief state.
+    """
+    from reality_executor import execute_in_reality
+
+    for action in actions:
+        predicted = predict_fn(ws, action)
+        next_ws, info = execute_in_reality(env, ws, action, perception_radius=perception_radius)
+        yield Transition(
+            t=ws.timestep,
+            state_pos=ws.agent_pos,
+            action=action,
+            predicted_next_pos=predicted,
+            actual_next_pos=next_ws.agent_pos,
+            info=info,
+        )
+        ws = next_ws
+        if stop_on_reward and info.get("reward", 0.0) > 0:
+            return
+
+
+def error_stage(batch: List[Transition]) -> List[Experience]:
+    """
+    Computes prediction error for a batch of transitions.
+    """
+    return [
+        Experience(
+            t=tr.t,
+            state_pos=tr.state_pos,
+            action=tr.action,
+            predicted_next_pos=tr.predicted_next_pos,
+            actual_next_pos=tr.actual_next_pos,
+            error=position_error(tr.predicted_next_pos, tr.actual_next_pos),
+            meta={"real_reward": float(tr.info.get("reward", 0.0))},
+        )
+        for tr in batch
+    ]
+
+
+def store_stage(store, *, only_errors: bool = True) -> BatchFn:
+    """
+    Builds a stage that writes experiences into a store and passes them on.
+
+    Uses store.add_many when the backend provides it.
+    """
+    add_many = getattr(store, "add_many", None)
+
+    def fn(batch: List[Experience]) -> List[Experience]:
+        keep = [e for e in batch if e.error > 0] if only_errors else batch
+        if add_many is not None:
+            add_many(keep)
+        else:
+            for e in keep:
+                store.add(e)
+        return batch
+
+    return fn
+
+
+def learn_stage(update_fn: Callable[[Pos, str, Pos, float], None]) -> BatchFn:
+    """
+    Builds a stage that feeds every experience to a model update rule.
+
+    update_fn has the error_weighted_update signature minus the model, e.g.
+        functools.partial(error_weighted_update, model)
+    """
+
+    def fn(batch: List[Experience]) -> List[Experience]:
+        for e in batch:
+            update_fn(e.state_pos, e.action, e.actual_next_pos, e.error)
+        return batch
+
+    return fn
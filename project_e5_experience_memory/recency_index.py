@@ -0,0 +1,167 @@
+"""
+Recency Index (Time-Aware Surprise)
+
+ExperienceStore.surprise_score averages over all history, so a surprise from
+long ago weighs as much as one from the last step.
+
+This module keeps per-(state_pos, action) aggregates that answer:
+- "average surprise in the last W steps"       (sliding window)
+- "decayed surprise with half-life h"          (exponential recency)
+
+Both run in O(1) (amortized) without touching individual Experience records:
+- decayed sums are stored relative to the key's last update time and rescaled
+  lazily on the next touch, so no global sweep is ever needed
+- window sums keep only (t, error) pairs and evict them as time advances
+
+Window lengths and half-lives are fixed at construction, which is what makes
+the queries constant time.
+
+Time must be non-decreasing across add() and query calls.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+
+from experience import Experience
+
+Pos = Tuple[int, int]
+Key = Tuple[Pos, str]  # (state_pos, action)
+
+
+class _KeyAggregate:
+    """
+    Time-indexed aggregates for a single (state_pos, action) key.
+    """
+
+    __slots__ = ("t_ref", "decayed_err", "decayed_n", "events", "heads", "win_err", "win_n")
+
+    def __init__(self, n_half_lives: int, n_windows: int):
+        self.t_ref = 0
+        self.decayed_err = [0.0] * n_half_lives
+        self.decayed_n = [0.0] * n_half_lives
+        self.events: List[Tuple[int, float]] = []
+        self.heads = [0] * n_windows
+        self.win_err = [0.0] * n_windows
+        self.win_n = [0] * n_windows
+
+
+@dataclass
+class RecencyIndex:
+    """
+    Recency-weighted and windowed surprise aggregates.
+
+    Index:
+        (state_pos, action) -> decayed sums per half-life
+                              + running window sums per window length
+
+    half_lives:
+        supported half-lives (in timesteps) for decayed queries
+    windows:
+        supported window lengths (in timesteps) for windowed queries
+    """
+    half_lives: Tuple[float, ...] = (100.0,)
+    windows: Tuple[int, ...] = (500,)
+    by_key: Dict[Key, _KeyAggregate] = field(default_factory=dict)
+
+    def __post_init__(self):
+        # per-step multiplicative decay for each half-life
+        self._decay = [0.5 ** (1.0 / float(h)) for h in self.half_lives]
+
+    def _advance(self, agg: _KeyAggregate, now: int) -> None:
+        """
+        Brings a key's aggregates forward to time `now`.
+        """
+        dt = now - agg.t_ref
+        if dt > 0:
+            for i, d in enumerate(self._decay):
+                f = d ** dt
+                agg.decayed_err[i] *= f
+                agg.decayed_n[i] *= f
+            agg.t_ref = now
+
+        events = agg.events
+        for i, w in enumerate(self.windows):
+            cutoff = now - w
+            j = agg.heads[i]
+            while j < len(events) and events[j][0] <= cutoff:
+                agg.win_err[i] -= events[j][1]
+                agg.win_n[i] -= 1
+                j += 1
+            agg.heads[i] = j
+            if agg.win_n[i] == 0:
+                agg.win_err[i] = 0.0  # drop accumulated float drift
+
+        # compact once the oldest still-needed event is deep into the list
+        oldest = min(agg.heads) if agg.heads else len(events)
+        if oldest > 32 and oldest * 2 > len(events):
+            del events[:oldest]
+            agg.heads = [j - oldest for j in agg.heads]
+
+    def add(self, exp: Experience) -> None:
+        """
+        Records an experience's error at its timestep.
+        """
+        key = (exp.state_pos, exp.action)
+        agg = self.by_key.get(key)
+        if agg is None:
+            agg = _KeyAggregate(len(self.half_lives), len(self.windows))
+            agg.t_ref = exp.t
+            self.by_key[key] = agg
+
+        self._advance(agg, exp.t)
+        err = float(exp.error)
+        for i in range(len(self.half_lives)):
+            agg.decayed_err[i] += err
+            agg.decayed_n[i] += 1.0
+        if self.windows:
+            agg.events.append((exp.t, err))
+            for i in range(len(self.windows)):
+                agg.win_err[i] += err
+                agg.win_n[i] += 1
+
+    def _lookup(self, state_pos: Pos, action: str, now: int):
+        agg = self.by_key.get((state_pos, action))
+        if agg is not None:
+            self._advance(agg, now)
+        return agg
+
+    def window_count(self, state_pos: Pos, action: str, now: int, window: int) -> int:
+        """
+        Number of surprises for this pair with t in (now - window, now].
+        """
+        i = self.windows.index(window)
+        agg = self._lookup(state_pos, action, now)
+        return 0 if agg is None else agg.win_n[i]
+
+    def windowed_surprise(self, state_pos: Pos, action: str, now: int, window: int) -> float:
+        """
+        Average prediction error over the last `window` steps.
+
+        Returns 0.0 if the pair produced no error inside the window.
+        """
+        i = self.windows.index(window)
+        agg = self._lookup(state_pos, action, now)
+        if agg is None or agg.win_n[i] == 0:
+            return 0.0
+        return agg.win_err[i] / float(agg.win_n[i])
+
+    def decayed_count(self, state_pos: Pos, action: str, now: int, half_life: float) -> float:
+        """
+        Exponentially decayed number of surprises at time `now`.
+        """
+        i = self.half_lives.index(half_life)
+        agg = self._lookup(state_pos, action, now)
+        return 0.0 if agg is None else agg.decayed_n[i]
+
+    def decayed_surprise(self, state_pos: Pos, action: str, now: int, half_life: float) -> float:
+        """
+        Recency-weighted average prediction error.
+
+        Each past error is weighted by 0.5 ** ((now - t) / half_life).
+        Returns 0.0 if the pair has never produced an error.
+        """
+        i = self.half_lives.index(half_life)
+        agg = self._lookup(state_pos, action, now)
+        if agg is None or agg.decayed_n[i] <= 0.0:
+            return 0.0
+        return agg.decayed_err[i] / agg.decayed_n[i]
@@ -0,0 +1,174 @@
+"""
+Spatial Index (Region Queries Over Experience)
+
+ExperienceStore answers questions about a single (state_pos, action) key.
+Planners often need regional questions instead:
+- How surprising is the region ahead?
+- Which mismatches happened within radius r of here?
+
+Both region queries use the square (Chebyshev) window of a radius, so
+region_surprise averages exactly the records within_radius returns.
+
+Answering those from by_key means scanning every record.
+
+This module keeps two spatial structures alongside the store:
+- 2D Fenwick trees (binary indexed trees) of per-cell error sums and counts,
+  giving rectangle aggregates in O(log W * log H) with O(log W * log H) inserts
+- uniform grid buckets of Experience records, so radius queries only visit
+  buckets that overlap the query window
+
+Indexing is by state_pos (where the agent was when it got surprised).
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+
+from experience import Experience
+
+Pos = Tuple[int, int]
+
+
+class _Fenwick2D:
+    """
+    2D binary indexed tree over a (width x height) grid of floats.
+
+    Supports point add and prefix-rectangle sums.
+    """
+
+    def __init__(self, width: int, height: int):
+        self.w = width
+        self.h = height
+        self.tree = [[0.0] * (width + 1) for _ in range(height + 1)]
+
+    def add(self, x: int, y: int, value: float) -> None:
+        j = y + 1
+        while j <= self.h:
+            row = self.tree[j]
+            i = x + 1
+            while i <= self.w:
+                row[i] += value
+                i += i & (-i)
+            j += j & (-j)
+
+    def prefix(self, x: int, y: int) -> float:
+        """
+        Sum over cells [0..x] x [0..y] (inclusive). Negative bounds give 0.
+        """
+        if x < 0 or y < 0:
+            return 0.0
+        x = min(x, self.w - 1)
+        y = min(y, self.h - 1)
+        s = 0.0
+        j = y + 1
+        while j > 0:
+            row = self.tree[j]
+            i = x + 1
+            while i > 0:
+                s += row[i]
+                i -= i & (-i)
+            j -= j & (-j)
+        return s
+
+    def rect(self, x0: int, y0: int, x1: int, y1: int) -> float:
+        """
+        Sum over the inclusive rectangle [x0..x1] x [y0..y1].
+        """
+        return (
+            self.prefix(x1, y1)
+            - self.prefix(x0 - 1, y1)
+            - self.prefix(x1, y0 - 1)
+            + self.prefix(x0 - 1, y0 - 1)
+        )
+
+
+@dataclass
+class SpatialExperienceIndex:
+    """
+    Region-queryable index of prediction-error experiences.
+
+    Index:
+        error_sum / count Fenwick trees over the grid
+        (bucket_x, bucket_y) -> list of Experience records
+
+    bucket_size controls the coarseness of the radius-query buckets.
+    Positions outside the grid are ignored.
+    """
+    grid_size: Tuple[int, int]
+    bucket_size: int = 8
+    buckets: Dict[Pos, List[Experience]] = field(default_factory=dict)
+
+    def __post_init__(self):
+        w, h = self.grid_size
+        self._error_sum = _Fenwick2D(w, h)
+        self._count = _Fenwick2D(w, h)
+
+    def _in_bounds(self, pos: Pos) -> bool:
+        x, y = pos
+        w, h = self.grid_size
+        return 0 <= x < w and 0 <= y < h
+
+    def add(self, exp: Experience) -> None:
+        """
+        Indexes a new experience by its state_pos.
+        """
+        if not self._in_bounds(exp.state_pos):
+            return
+        x, y = exp.state_pos
+        self._error_sum.add(x, y, float(exp.error))
+        self._count.add(x, y, 1.0)
+        b = (x // self.bucket_size, y // self.bucket_size)
+        self.buckets.setdefault(b, []).append(exp)
+
+    def rect_stats(self, top_left: Pos, bottom_right: Pos) -> Tuple[int, float]:
+        """
+        Returns (count, error_sum) over an inclusive rectangle.
+
+        The rectangle is clipped to the grid.
+        """
+        x0, y0 = max(0, top_left[0]), max(0, top_left[1])
+        x1, y1 = bottom_right
+        if x0 > x1 or y0 > y1:
+            return 0, 0.0
+        n = self._count.rect(x0, y0, x1, y1)
+        s = self._error_sum.rect(x0, y0, x1, y1)
+        return int(round(n)), float(s)
+
+    def rect_surprise(self, top_left: Pos, bottom_right: Pos) -> float:
+        """
+        Average prediction error inside a rectangle.
+
+        Returns 0.0 if no experience falls inside it.
+        """
+        n, s = self.rect_stats(top_left, bottom_right)
+        if n == 0:
+            return 0.0
+        return s / float(n)
+
+    def region_surprise(self, center: Pos, radius: int) -> float:
+        """
+        Average prediction error in the square window of the given radius,
+        i.e. over the records within_radius(center, radius) returns.
+
+        This is the cheap regional signal meant for rollout penalties.
+        """
+        cx, cy = center
+        return self.rect_surprise((cx - radius, cy - radius), (cx + radius, cy + radius))
+
+    def within_radius(self, center: Pos, radius: int) -> List[Experience]:
+        """
+        Returns all experiences whose state_pos is within Chebyshev
+        distance `radius` of center (the square window region_surprise
+        averages over).
+
+        Only buckets overlapping the query window are visited.
+        """
+        cx, cy = center
+        bs = self.bucket_size
+        out: List[Experience] = []
+        for by in range((cy - radius) // bs, (cy + radius) // bs + 1):
+            for bx in range((cx - radius) // bs, (cx + radius) // bs + 1):
+                for e in self.buckets.get((bx, by), ()):
+                    x, y = e.state_pos
+                    if max(abs(x - cx), abs(y - cy)) <= radius:
+                        out.append(e)
+        return out
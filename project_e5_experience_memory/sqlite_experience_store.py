@@ -0,0 +1,175 @@
+"""
+SQLite Experience Store (Persistent Memory of Prediction Errors)
+
+This module implements an ExperienceStore-compatible backend on local SQLite.
+
+Why:
+- in-memory by_key dicts vanish with the process
+- pickling them is slow and cannot be queried
+- offline analysis wants to aggregate many runs in one place
+
+Design:
+- WAL journal mode so readers do not block the writing agent loop
+- synchronous=NORMAL and a large page cache; WAL keeps this crash-safe
+- add() buffers rows; full batches go through executemany in one transaction
+- indexed (state, action) and t columns
+- count / surprise_score are computed SQL-side (COUNT / AVG)
+
+Queries flush pending rows first, so reads always see every add().
+"""
+
+import json
+import sqlite3
+from typing import Iterable, List, Tuple
+
+from experience import Experience
+
+Pos = Tuple[int, int]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS experiences (
+    id     INTEGER PRIMARY KEY,
+    t      INTEGER NOT NULL,
+    sx     INTEGER NOT NULL,
+    sy     INTEGER NOT NULL,
+    action TEXT    NOT NULL,
+    px     INTEGER NOT NULL,
+    py     INTEGER NOT NULL,
+    ax     INTEGER NOT NULL,
+    ay     INTEGER NOT NULL,
+    error  REAL    NOT NULL,
+    meta   TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_experiences_key ON experiences (sx, sy, action);
+CREATE INDEX IF NOT EXISTS idx_experiences_t ON experiences (t);
+"""
+
+_INSERT = (
+    "INSERT INTO experiences (t, sx, sy, action, px, py, ax, ay, error, meta) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+
+def _to_row(exp: Experience) -> tuple:
+    sx, sy = exp.state_pos
+    px, py = exp.predicted_next_pos
+    ax, ay = exp.actual_next_pos
+    meta = json.dumps(exp.meta) if exp.meta else None
+    return (exp.t, sx, sy, exp.action, px, py, ax, ay, float(exp.error), meta)
+
+
+def _from_row(row: tuple) -> Experience:
+    t, sx, sy, action, px, py, ax, ay, error, meta = row
+    return Experience(
+        t=t,
+        state_pos=(sx, sy),
+        action=action,
+        predicted_next_pos=(px, py),
+        actual_next_pos=(ax, ay),
+        error=error,
+        meta=json.loads(meta) if meta else {},
+    )
+
+
+class SQLiteExperienceStore:
+    """
+    Persistent experience store with the ExperienceStore query interface.
+
+    Index:
+        (sx, sy, action) and t columns
+
+    path:
+        database file, or ":memory:" for a throwaway store
+    batch_size:
+        number of buffered rows that triggers a bulk insert
+    """
+
+    def __init__(self, path: str = ":memory:", *, batch_size: int = 16384):
+        self.path = path
+        self.batch_size = int(batch_size)
+        self._pending: List[tuple] = []
+
+        self.conn = sqlite3.connect(path, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA cache_size=-65536")
+        self.conn.execute("PRAGMA temp_store=MEMORY")
+        self.conn.executescript(_SCHEMA)
+
+    def add(self, exp: Experience) -> None:
+        """
+        Buffers a new experience; writes happen in batches.
+        """
+        self._pending.append(_to_row(exp))
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def add_many(self, exps: Iterable[Experience]) -> None:
+        """
+        Bulk-adds experiences, writing full batches as they fill.
+        """
+        self._pending.extend(_to_row(e) for e in exps)
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Writes all buffered rows in a single transaction.
+        """
+        if not self._pending:
+            return
+        rows, self._pending = self._pending, []
+        cur = self.conn.cursor()
+        cur.execute("BEGIN")
+        try:
+            cur.executemany(_INSERT, rows)
+        except Exception:
+            cur.execute("ROLLBACK")
+            raise
+        cur.execute("COMMIT")
+
+    def get(self, state_pos: Pos, action: str) -> List[Experience]:
+        """
+        Returns all experiences for a given (state, action) pair, oldest first.
+        """
+        self.flush()
+        sx, sy = state_pos
+        cur = self.conn.execute(
+            "SELECT t, sx, sy, action, px, py, ax, ay, error, meta FROM experiences "
+            "WHERE sx = ? AND sy = ? AND action = ? ORDER BY id",
+            (sx, sy, action),
+        )
+        return [_from_row(r) for r in cur.fetchall()]
+
+    def count(self, state_pos: Pos, action: str) -> int:
+        """
+        Number of times this (state, action) pair produced surprise.
+        """
+        self.flush()
+        sx, sy = state_pos
+        (n,) = self.conn.execute(
+            "SELECT COUNT(*) FROM experiences WHERE sx = ? AND sy = ? AND action = ?",
+            (sx, sy, action),
+        ).fetchone()
+        return int(n)
+
+    def surprise_score(self, state_pos: Pos, action: str) -> float:
+        """
+        Average prediction error for this (state, action) pair.
+
+        Returns 0.0 if the pair has never produced an error.
+        """
+        self.flush()
+        sx, sy = state_pos
+        (avg,) = self.conn.execute(
+            "SELECT AVG(error) FROM experiences WHERE sx = ? AND sy = ? AND action = ?",
+            (sx, sy, action),
+        ).fetchone()
+        return 0.0 if avg is None else float(avg)
+
+    def close(self) -> None:
+        """
+        Flushes pending rows and closes the connection.
+        """
+        self.flush()
+        self.conn.close()
@@ -12,12 +12,33 @@ These tests validate the most important invariants:
    - counts correctly
    - computes average surprise correctly
 
+3) SpatialExperienceIndex:
+   - rectangle and radius queries agree with a brute-force scan
+
+4) RecencyIndex:
+   - windowed surprise forgets old errors
+   - decayed surprise halves an error's weight after one half-life
+
+5) SQLiteExperienceStore:
+   - matches ExperienceStore counts and scores after batched inserts
+
+6) StreamingPipeline:
+   - every transition reaches every stage, in order, across micro-batches
+   - buffers stay bounded; a slow stage fills its input buffer, stalls
+     the stage feeding it and is reported as the bottleneck
+
 These are minimal regression tests to keep the learning signal stable.
 """
 
+import time
+
 from experience_store import ExperienceStore
 from experience import Experience
 from error_metrics import position_error
+from spatial_index import SpatialExperienceIndex
+from recency_index import RecencyIndex
+from sqlite_experience_store import SQLiteExperienceStore
+from pipeline import StreamingPipeline, Stage, Transition, error_stage, store_stage, learn_stage
 
 
 def test_position_error():
@@ -55,7 +76,135 @@ def test_store_add_and_scores():
     assert abs(store.surprise_score((0, 0), "right") - 1.0) < 1e-9
 
 
+def test_spatial_index_region_queries():
+    store = ExperienceStore(spatial=SpatialExperienceIndex(grid_size=(10, 10), bucket_size=3))
+
+    points = [((1, 1), 1.0), ((2, 3), 2.0), ((5, 5), 4.0), ((9, 9), 1.0), ((2, 3), 1.0)]
+    for t, (pos, err) in enumerate(points):
+        store.add(Experience(
+            t=t,
+            state_pos=pos,
+            action="right",
+            predicted_next_pos=pos,
+            actual_next_pos=pos,
+            error=err,
+            meta={},
+        ))
+
+    n, s = store.spatial.rect_stats((0, 0), (3, 3))
+    assert n == 3 and abs(s - 4.0) < 1e-9
+    assert abs(store.spatial.region_surprise((5, 5), 0) - 4.0) < 1e-9
+    assert store.spatial.rect_surprise((6, 0), (8, 4)) == 0.0
+
+    near = store.spatial.within_radius((2, 2), 2)
+    assert sorted(e.state_pos for e in near) == [(1, 1), (2, 3), (2, 3)]
+
+    # same square window as region_surprise: corners count
+    near = store.spatial.within_radius((3, 3), 2)
+    assert sorted(e.state_pos for e in near) == [(1, 1), (2, 3), (2, 3), (5, 5)]
+    mean = sum(e.error for e in near) / len(near)
+    assert abs(store.spatial.region_surprise((3, 3), 2) - mean) < 1e-9
+
+
+def test_recency_index_window_and_decay():
+    store = ExperienceStore(recency=RecencyIndex(half_lives=(10.0,), windows=(5,)))
+
+    for t, err in [(0, 3.0), (10, 1.0)]:
+        store.add(Experience(
+            t=t,
+            state_pos=(0, 0),
+            action="up",
+            predicted_next_pos=(0, 0),
+            actual_next_pos=(0, 0),
+            error=err,
+            meta={},
+        ))
+
+    idx = store.recency
+    assert idx.window_count((0, 0), "up", now=10, window=5) == 1
+    assert abs(idx.windowed_surprise((0, 0), "up", now=10, window=5) - 1.0) < 1e-9
+    assert idx.windowed_surprise((0, 0), "up", now=20, window=5) == 0.0
+
+    # at t=10 the first error has weight 0.5: (0.5*3 + 1) / (0.5 + 1)
+    expected = (0.5 * 3.0 + 1.0) / 1.5
+    assert abs(idx.decayed_surprise((0, 0), "up", now=10, half_life=10.0) - expected) < 1e-9
+    assert abs(idx.decayed_count((0, 0), "up", now=20, half_life=10.0) - 0.75) < 1e-9
+
+
+def test_sqlite_store_matches_memory_store():
+    mem = ExperienceStore()
+    db = SQLiteExperienceStore(":memory:", batch_size=2)
+
+    for t, err in enumerate([1.0, 2.0, 0.0]):
+        e = Experience(
+            t=t,
+            state_pos=(1, 2),
+            action="left",
+            predicted_next_pos=(0, 2),
+            actual_next_pos=(1, 2),
+            error=err,
+            meta={"tag": t} if t else {},
+        )
+        mem.add(e)
+        db.add(e)
+
+    assert db.count((1, 2), "left") == mem.count((1, 2), "left") == 3
+    assert abs(db.surprise_score((1, 2), "left") - mem.surprise_score((1, 2), "left")) < 1e-9
+    assert db.surprise_score((0, 0), "left") == 0.0
+    assert db.get((1, 2), "left") == mem.get((1, 2), "left")
+    db.close()
+
+
+def test_streaming_pipeline_batches():
+    transitions = [
+        Transition(t=t, state_pos=(t, 0), action="right",
+                   predicted_next_pos=(t + 1, 0),
+                   actual_next_pos=(t + 1, 0) if t % 3 else (t, 0),
+                   info={"reward": 0.0})
+        for t in range(10)
+    ]
+    store = ExperienceStore()
+    updates = []
+
+    pipe = StreamingPipeline(
+        stages=[
+            Stage("error", error_stage),
+            Stage("store", store_stage(store)),
+            Stage("learn", learn_stage(lambda s, a, n, err: updates.append((s, err)))),
+        ],
+        batch_size=4,
+        capacity=4,
+    )
+    stats = pipe.run(transitions)
+
+    assert [s for s, _ in updates] == [tr.state_pos for tr in transitions]
+    assert sum(store.count((t, 0), "right") for t in range(10)) == 4  # t = 0, 3, 6, 9
+    assert stats["learn"].items == 10 and stats["learn"].batches == 3
+    assert all(st.max_depth <= 4 for st in stats.values())
+
+    # a deliberately slow stage fills its input buffer and stalls upstream
+    def slow_stage(batch):
+        time.sleep(0.002)
+        return batch
+
+    out = []
+    pipe = StreamingPipeline(
+        stages=[Stage("fast", lambda b: b), Stage("slow", slow_stage), Stage("sink", out.extend)],
+        batch_size=4,
+        capacity=8,
+    )
+    stats = pipe.run(range(64))
+    assert out == list(range(64))
+    assert stats["slow"].max_depth == 8 and stats["fast"].max_depth <= 8
+    assert stats["fast"].stalls > 0 and stats["slow"].stalls == 0
+    assert pipe.bottleneck() == "slow"
+
+
 if __name__ == "__main__":
     test_position_error()
     test_store_add_and_scores()
+    test_spatial_index_region_queries()
+    test_recency_index_window_and_decay()
+    test_sqlite_store_matches_memory_store()
+    test_streaming_pipeline_batches()
     print("✅ tests passed")
@@ -13,6 +13,7 @@ This keeps learning modular and explainable.
 """
 
 from experience_store import ExperienceStore
+from spatial_index import SpatialExperienceIndex
 
 
 def rollout_penalty_from_experience(
@@ -43,3 +44,23 @@ def rollout_penalty_from_experience(
         approx_log_1pn += 1.0 / k
 
     return float(avg) * (1.0 + approx_log_1pn)
+
+
+def regional_penalty_from_experience(
+    index: SpatialExperienceIndex,
+    pos,
+    radius: int = 2,
+) -> float:
+    """
+    Converts regional surprise into a rollout penalty.
+
+    Intuition:
+        A cell surrounded by past mismatches is risky to enter,
+        even if this exact (state, action) was never tried.
+
+    v1 formulation:
+        penalty = avg_error over the square window around pos
+
+    Cost is O(log W * log H), cheap enough to call per rollout step.
+    """
+    return float(index.region_surprise(pos, radius))
@@ -5,6 +5,100 @@ Defines the canonical set of actions available to the agent.
 
 This file is intentionally minimal and reused across projects.
 Keeping actions centralized avoids planner-specific assumptions.
+
+Integer IDs:
+    Each action has a stable integer id (its index in ACTIONS) and a row in
+    a (dx, dy) delta table. Dynamics accept either the name or the id, so
+    hot paths can pass ints and index the table instead of comparing
+    strings.
+
+Custom action sets:
+    ActionSpace(...) builds a registry for another set of moves (e.g.
+    diagonals). Code that takes an `actions` / `space` argument then works
+    without editing each dynamics module.
 """
 
+from numbers import Integral
+from typing import Dict, List, Sequence, Tuple, Union
+
 ACTIONS = ["up", "down", "left", "right", "stay"]
+
+Delta = Tuple[int, int]
+ActionLike = Union[str, int]
+
+
+class ActionSpace:
+    """
+    Registry of discrete actions: name <-> id, and id -> (dx, dy).
+    """
+
+    def __init__(self, names: Sequence[str], deltas: Sequence[Delta]):
+        if len(names) != len(deltas):
+            raise ValueError("names and deltas must have the same length")
+        self.names: List[str] = list(names)
+        self.deltas: List[Delta] = [tuple(d) for d in deltas]
+        self.ids: Dict[str, int] = {n: i for i, n in enumerate(self.names)}
+        self._by_name: Dict[str, Delta] = dict(zip(self.names, self.deltas))
+        if len(self.ids) != len(self.names):
+            raise ValueError("duplicate action names")
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def register(self, name: str, delta: Delta) -> int:
+        """
+        Adds an action and returns its id.
+        """
+        if name in self.ids:
+            raise ValueError(f"Action already registered: {name}")
+        self.ids[name] = len(self.names)
+        self.names.append(name)
+        self.deltas.append(tuple(delta))
+        self._by_name[name] = self.deltas[-1]
+        return self.ids[name]
+
+    def id(self, action: ActionLike) -> int:
+        """
+        Integer id for a name or id.
+        """
+        if isinstance(action, str):
+            i = self.ids.get(action)
+        elif isinstance(action, Integral) and 0 <= action < len(self.names):
+            i = int(action)
+        else:
+            i = None
+        if i is None:
+            raise ValueError(f"Unknown action: {action}")
+        return i
+
+    def name(self, action: ActionLike) -> str:
+        return self.names[self.id(action)]
+
+    def delta(self, action: ActionLike) -> Delta:
+        """
+        (dx, dy) for a name or id.
+        """
+        try:
+            if isinstance(action, str):
+                return self._by_name[action]
+            if action >= 0:
+                return self.deltas[action]
+        except (KeyError, IndexError, TypeError):
+            pass
+        raise ValueError(f"Unknown action: {action}")
+
+
+DEFAULT_ACTION_SPACE = ActionSpace(
+    ACTIONS,
+    [(0, -1), (0, 1), (-1, 0), (1, 0), (0, 0)],
+)
+
+UP, DOWN, LEFT, RIGHT, STAY = range(len(ACTIONS))
+
+
+def action_id(action: ActionLike) -> int:
+    return DEFAULT_ACTION_SPACE.id(action)
+
+
+def action_delta(action: ActionLike) -> Delta:
+    return DEFAULT_ACTION_SPACE.delta(action)
@@ -14,11 +14,16 @@ even before sufficient experience is collected.
 
 from typing import Tuple
 from state_adapter import SimpleWorldState
+from action_space import ActionLike, ActionSpace, DEFAULT_ACTION_SPACE
 
 Pos = Tuple[int, int]
 
 
-def fallback_predict_next(ws: SimpleWorldState, action: str) -> Pos:
+def fallback_predict_next(
+    ws: SimpleWorldState,
+    action: ActionLike,
+    space: ActionSpace = DEFAULT_ACTION_SPACE,
+) -> Pos:
     """
     Predicts next position using belief-based rules.
 
@@ -30,20 +35,7 @@ def fallback_predict_next(ws: SimpleWorldState, action: str) -> Pos:
     This mirrors the belief transition model from earlier projects.
     """
     x, y = ws.agent_pos
-    dx, dy = 0, 0
-
-    if action == "up":
-        dy = -1
-    elif action == "down":
-        dy = 1
-    elif action == "left":
-        dx = -1
-    elif action == "right":
-        dx = 1
-    elif action == "stay":
-        pass
-    else:
-        raise ValueError(f"Unknown action: {action}")
+    dx, dy = space.delta(action)
 
     nx, ny = x + dx, y + dy
     w, h = ws.grid_size
@@ -9,10 +9,16 @@ Important:
 - Planning never has direct access to this model.
 
 Reused pattern from earlier projects, included to keep E6 self-contained.
+
+snapshot() / restore() make oracle rollouts against reality cheap: the grid
+is shared, agent state is a tuple, and cell edits go through set_cell(),
+which journals them for undo.
 """
 
-from dataclasses import dataclass
-from typing import List, Tuple, Dict
+from dataclasses import dataclass, field
+from typing import List, Tuple, Dict, Union
+
+from action_space import ActionSpace, DEFAULT_ACTION_SPACE
 
 Pos = Tuple[int, int]
 
@@ -21,6 +27,10 @@ Pos = Tuple[int, int]
 class GridworldEnv:
     grid: List[List[str]]  # '.' empty, '#' obstacle, 'G' goal
     agent_pos: Pos
+    action_space: ActionSpace = DEFAULT_ACTION_SPACE
+    _journal: List[Tuple[Pos, str]] = field(default_factory=list, init=False, repr=False)
+    _journaling: bool = field(default=False, init=False, repr=False)
+    _epoch: int = field(default=0, init=False, repr=False)
 
     @property
     def size(self) -> Tuple[int, int]:
@@ -40,16 +50,9 @@ class GridworldEnv:
     def is_obstacle(self, pos: Pos) -> bool:
         return self.cell(pos) == "#"
 
-    def step(self, action: str) -> Tuple[Pos, Dict[str, float]]:
+    def step(self, action: Union[str, int]) -> Tuple[Pos, Dict[str, float]]:
         x, y = self.agent_pos
-        dx, dy = 0, 0
-
-        if action == "up": dy = -1
-        elif action == "down": dy = 1
-        elif action == "left": dx = -1
-        elif action == "right": dx = 1
-        elif action == "stay": pass
-        else: raise ValueError(f"Unknown action: {action}")
+        dx, dy = self.action_space.delta(action)
 
         nxt = (x + dx, y + dy)
         if (not self.in_bounds(nxt)) or self.is_obstacle(nxt):
@@ -58,3 +61,50 @@ class GridworldEnv:
         self.agent_pos = nxt
         reward = 1.0 if self.cell(nxt) == "G" else 0.0
         return self.agent_pos, {"reward": reward}
+
+    def set_cell(self, pos: Pos, value: str) -> None:
+        """
+        Changes one grid cell (e.g. a door opening). Once snapshot() has
+        been called, the old value is journaled so restore() can undo it;
+        commit() ends journaling.
+
+        The grid list is edited in place: envs that call set_cell must not
+        share a grid (e.g. [grid] * 3), or each edit changes all of them.
+        """
+        x, y = pos
+        if self._journaling:
+            self._journal.append((pos, self.grid[y][x]))
+        self.grid[y][x] = value
+
+    def snapshot(self) -> Tuple[Pos, int, int]:
+        """
+        O(1) token for the current state. The grid is shared, not copied.
+        Tokens carry the commit epoch, so restore() rejects stale ones.
+        """
+        self._journaling = True
+        return (self.agent_pos, len(self._journal), self._epoch)
+
+    def commit(self) -> None:
+        """
+        Keeps the current grid and drops the undo journal, so long-running
+        edits (e.g. a toggling door) do not accumulate. Tokens taken before
+        the commit can no longer be restored.
+        """
+        self._journal.clear()
+        self._journaling = False
+        self._epoch += 1
+
+    def restore(self, token: Tuple[Pos, int, int]) -> None:
+        """
+        Returns to a snapshot, undoing cell changes made since.
+
+        Snapshots nest like a stack: restoring an older token invalidates
+        tokens taken after it.
+        """
+        pos, n, epoch = token
+        if epoch != self._epoch or n > len(self._journal):
+            raise ValueError("Snapshot token predates commit()")
+        while len(self._journal) > n:
+            (x, y), old = self._journal.pop()
+            self.grid[y][x] = old
+        self.agent_pos = pos
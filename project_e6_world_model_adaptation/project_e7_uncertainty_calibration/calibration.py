@@ -5,29 +5,23 @@ This module tracks whether predicted confidence aligns with empirical accuracy.
 
 Confidence values are bucketed into bins and compared against observed
 correctness, forming a lightweight reliability diagram.
-"""
 
-from dataclasses import dataclass, field
-from typing import Dict, List, Tuple
+Summary scores:
+- ECE: expected calibration error (count-weighted bin gap)
+- MCE: maximum calibration error (worst bin gap)
+- Brier score: mean squared error of confidence vs correctness
 
+RollingCalibrationTracker covers the non-stationary case: it forgets old
+outcomes (ring-buffer window or exponential decay), keeps a rolling ECE in
+O(1) per update, and raises a drift signal when that error crosses a
+threshold, e.g. after the world changes under a trained model.
+"""
 
-@dataclass
-class CalibrationBin:
-    """
-    Stores outcomes for a single confidence bin.
-    """
-    correct: int = 0
-    total: int = 0
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+import math
 
-    def add(self, is_correct: bool):
-        self.total += 1
-        if is_correct:
-            self.correct += 1
-
-    def accuracy(self) -> float:
-        if self.total == 0:
-            return 0.0
-        return float(self.correct) / float(self.total)
+import numpy as np
 
 
 @dataclass
@@ -35,34 +29,241 @@ class CalibrationTracker:
     """
     Tracks calibration across confidence bins.
 
-    Bins:
+    Bins (n_bins=10):
         [0.0–0.1), [0.1–0.2), ..., [0.9–1.0]
 
     Used to detect:
         - overconfidence (high confidence, low accuracy)
         - underconfidence (low confidence, high accuracy)
+
+    Storage is array-backed: per-bin counts, correct counts and confidence
+    sums, plus a running Brier sum. add() is O(1), add_many() is one
+    vectorized pass, and ECE / MCE / Brier read the sums in O(n_bins).
+
+    Trackers with the same n_bins can be merge()d, so results from parallel
+    workers or seeds reduce by simple addition.
     """
-    bins: Dict[int, CalibrationBin] = field(
-        default_factory=lambda: {i: CalibrationBin() for i in range(10)}
-    )
+    n_bins: int = 10
+    total: np.ndarray = field(init=False)
+    correct: np.ndarray = field(init=False)
+    conf_sum: np.ndarray = field(init=False)
+    brier_sum: float = field(init=False, default=0.0)
+
+    def __post_init__(self):
+        if self.n_bins < 1:
+            raise ValueError("n_bins must be >= 1")
+        self.total = np.zeros(self.n_bins, dtype=np.int64)
+        self.correct = np.zeros(self.n_bins, dtype=np.int64)
+        self.conf_sum = np.zeros(self.n_bins, dtype=np.float64)
 
     def _bin_index(self, conf: float) -> int:
         c = max(0.0, min(1.0, float(conf)))
-        idx = int(c * 10.0)
-        return 9 if idx == 10 else idx
+        idx = int(c * self.n_bins)
+        return self.n_bins - 1 if idx == self.n_bins else idx
 
     def add(self, confidence: float, is_correct: bool):
-        self.bins[self._bin_index(confidence)].add(is_correct)
+        c = max(0.0, min(1.0, float(confidence)))
+        i = self._bin_index(c)
+        self.total[i] += 1
+        self.conf_sum[i] += c
+        y = 1.0 if is_correct else 0.0
+        if is_correct:
+            self.correct[i] += 1
+        self.brier_sum += (c - y) ** 2
+
+    def add_many(self, confidence, is_correct):
+        """
+        Adds a batch of (confidence, correctness) pairs in one pass.
+        """
+        c = np.clip(np.asarray(confidence, dtype=np.float64).ravel(), 0.0, 1.0)
+        y = np.asarray(is_correct, dtype=bool).ravel()
+        if c.shape != y.shape:
+            raise ValueError("confidence and is_correct must have the same length")
+        idx = np.minimum((c * self.n_bins).astype(np.int64), self.n_bins - 1)
+        self.total += np.bincount(idx, minlength=self.n_bins)
+        self.correct += np.bincount(idx, weights=y, minlength=self.n_bins).astype(np.int64)
+        self.conf_sum += np.bincount(idx, weights=c, minlength=self.n_bins)
+        self.brier_sum += float(np.sum((c - y) ** 2))
+
+    def merge(self, other: "CalibrationTracker") -> "CalibrationTracker":
+        """
+        Adds another tracker's counts into this one and returns self.
+        """
+        if other.n_bins != self.n_bins:
+            raise ValueError("cannot merge trackers with different n_bins")
+        self.total += other.total
+        self.correct += other.correct
+        self.conf_sum += other.conf_sum
+        self.brier_sum += other.brier_sum
+        return self
+
+    def count(self) -> int:
+        return int(self.total.sum())
+
+    def _gaps(self) -> np.ndarray:
+        """
+        |accuracy - mean confidence| per bin (0 for empty bins).
+        """
+        n = np.maximum(self.total, 1)
+        return np.where(self.total > 0, np.abs(self.correct / n - self.conf_sum / n), 0.0)
+
+    def ece(self) -> float:
+        """
+        Expected calibration error: count-weighted mean bin gap.
+        """
+        n = self.count()
+        if n == 0:
+            return 0.0
+        return float(np.dot(self.total, self._gaps()) / n)
+
+    def mce(self) -> float:
+        """
+        Maximum calibration error: worst non-empty bin gap.
+        """
+        if self.count() == 0:
+            return 0.0
+        return float(self._gaps().max())
+
+    def brier(self) -> float:
+        """
+        Mean squared error between confidence and correctness.
+        """
+        n = self.count()
+        if n == 0:
+            return 0.0
+        return self.brier_sum / n
 
     def report(self) -> List[Tuple[str, float, float, int]]:
         """
         Returns rows:
             (bin_range, confidence_midpoint, empirical_accuracy, count)
         """
+        prec = max(1, math.ceil(math.log10(self.n_bins)))
         out = []
-        for i in range(10):
-            lo, hi = i / 10.0, (i + 1) / 10.0
+        for i in range(self.n_bins):
+            lo, hi = i / self.n_bins, (i + 1) / self.n_bins
             mid = (lo + hi) / 2.0
-            b = self.bins[i]
-            out.append((f"{lo:.1f}-{hi:.1f}", mid, b.accuracy(), b.total))
+            n = int(self.total[i])
+            acc = float(self.correct[i]) / float(n) if n else 0.0
+            out.append((f"{lo:.{prec}f}-{hi:.{prec}f}", mid, acc, n))
         return out
+
+
+@dataclass
+class RollingCalibrationTracker:
+    """
+    Calibration over recent outcomes only, with a drift signal.
+
+    Modes (exactly one):
+        window=W:     ring buffer of the last W outcomes
+        half_life=h:  each outcome's weight halves every h updates
+
+    Rolling ECE uses n_b * |acc_b - conf_b| = |correct_b - conf_sum_b|, so
+    ECE = Σ_b |correct_b - conf_sum_b| / N. Each update changes at most two
+    bins (the new one and, in window mode, the evicted one), so the sum is
+    patched in O(1). In decay mode every term shrinks by the same factor, so
+    weights are stored inflated by λ^-t and rescaled lazily instead.
+
+    Drift:
+        add() returns True while rolling ECE > drift_threshold and the
+        effective sample size is at least min_samples. drift_events counts
+        transitions into the drifting state.
+    """
+    n_bins: int = 10
+    window: Optional[int] = None
+    half_life: Optional[float] = None
+    drift_threshold: float = 0.2
+    min_samples: float = 20.0
+    drifting: bool = field(init=False, default=False)
+    drift_events: int = field(init=False, default=0)
+
+    def __post_init__(self):
+        if (self.window is None) == (self.half_life is None):
+            raise ValueError("set exactly one of window or half_life")
+        if self.window is not None and self.window < 1:
+            raise ValueError("window must be >= 1")
+        self._n = [0.0] * self.n_bins
+        self._correct = [0.0] * self.n_bins
+        self._conf = [0.0] * self.n_bins
+        self._gap_sum = 0.0
+        self._total = 0.0
+
+        # window mode: ring buffer of (bin, confidence, correct)
+        self._ring: List[Tuple[int, float, float]] = []
+        self._head = 0
+
+        # decay mode: current inflation λ^-t applied to new samples
+        self._decay = 0.5 ** (1.0 / float(self.half_life)) if self.half_life else 1.0
+        self._scale = 1.0
+
+    def _bin_index(self, c: float) -> int:
+        idx = int(c * self.n_bins)
+        return self.n_bins - 1 if idx == self.n_bins else idx
+
+    def _apply(self, i: int, c: float, y: float, w: float) -> None:
+        self._gap_sum -= abs(self._correct[i] - self._conf[i])
+        self._n[i] += w
+        self._correct[i] += w * y
+        self._conf[i] += w * c
+        self._gap_sum += abs(self._correct[i] - self._conf[i])
+        self._total += w
+
+    def _rescale(self) -> None:
+        f = 1.0 / self._scale
+        for i in range(self.n_bins):
+            self._n[i] *= f
+            self._correct[i] *= f
+            self._conf[i] *= f
+        self._gap_sum *= f
+        self._total *= f
+        self._scale = 1.0
+
+    def add(self, confidence: float, is_correct: bool) -> bool:
+        """
+        Adds one outcome and returns the current drift signal.
+        """
+        c = max(0.0, min(1.0, float(confidence)))
+        y = 1.0 if is_correct else 0.0
+        i = self._bin_index(c)
+
+        if self.window is not None:
+            if len(self._ring) < self.window:
+                self._ring.append((i, c, y))
+            else:
+                oi, oc, oy = self._ring[self._head]
+                self._apply(oi, oc, oy, -1.0)
+                self._ring[self._head] = (i, c, y)
+                self._head = (self._head + 1) % self.window
+            self._apply(i, c, y, 1.0)
+        else:
+            self._scale /= self._decay
+            if self._scale > 1e100:
+                self._rescale()
+            self._apply(i, c, y, self._scale)
+
+        drifting = self.effective_count() >= self.min_samples and self.ece() > self.drift_threshold
+        if drifting and not self.drifting:
+            self.drift_events += 1
+        self.drifting = drifting
+        return drifting
+
+    def effective_count(self) -> float:
+        """
+        Number of outcomes in the window, or decayed total weight.
+        """
+        return self._total / self._scale
+
+    def ece(self) -> float:
+        """
+        Rolling expected calibration error.
+        """
+        if self._total <= 0.0:
+            return 0.0
+        return max(0.0, self._gap_sum / self._total)
+
+    def reset(self) -> None:
+        """
+        Forgets everything, e.g. after the model itself was reset.
+        """
+        self.__post_init__()
+        self.drifting = False
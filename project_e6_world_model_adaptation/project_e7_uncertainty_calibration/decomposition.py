@@ -9,10 +9,15 @@ This separation allows planning and exploration policies to treat
 ignorance differently from noise.
 """
 
-from typing import Dict, Tuple
-from uncertainty_metrics import normalized_entropy
+from typing import Dict, List, Optional, Tuple
+import math
+
+import numpy as np
+
+from uncertainty_metrics import normalized_entropy, normalized_entropy_batch, pad_distributions
 
 Pos = Tuple[int, int]
+Key = Tuple[Pos, str]
 
 
 def epistemic_uncertainty(sample_count: float, *, k: float = 10.0) -> float:
@@ -43,6 +48,19 @@ def aleatoric_uncertainty(dist: Dict[Pos, float]) -> float:
     return float(normalized_entropy(dist))
 
 
+def decompose_stats(h: float, n_outcomes: int, sample_count: float) -> Dict[str, float]:
+    """
+    Same as decompose(), from precomputed statistics.
+
+    h is the entropy of the outcome distribution and n_outcomes its support
+    size, as maintained incrementally by the tabular model. This avoids
+    building the distribution at all.
+    """
+    ue = epistemic_uncertainty(sample_count)
+    ua = float(h / (math.log(n_outcomes) + 1e-12)) if n_outcomes > 1 else 0.0
+    return {"epistemic": ue, "aleatoric": ua, "total": float(0.5 * ue + 0.5 * ua)}
+
+
 def decompose(dist: Dict[Pos, float], sample_count: float) -> Dict[str, float]:
     """
     Returns a dictionary with:
@@ -56,3 +74,35 @@ def decompose(dist: Dict[Pos, float], sample_count: float) -> Dict[str, float]:
     ua = aleatoric_uncertainty(dist)
     total = 0.5 * ue + 0.5 * ua
     return {"epistemic": ue, "aleatoric": ua, "total": float(total)}
+
+
+def decompose_many(
+    model,
+    keys: Optional[List[Key]] = None,
+    *,
+    k: float = 10.0,
+) -> Tuple[List[Key], Dict[str, np.ndarray]]:
+    """
+    Decomposes uncertainty for many (state, action) pairs at once.
+
+    model must expose tabular counts / total dicts
+    (as TabularTransitionModel does). keys defaults to every key in the model.
+
+    Returns:
+        (keys, {"epistemic": [N], "aleatoric": [N], "total": [N]})
+
+    Row i matches decompose(model.distribution(*keys[i]), model.total[keys[i]]).
+    """
+    if keys is None:
+        keys = list(model.counts.keys())
+
+    C, mask = pad_distributions([model.counts.get(key, {}) for key in keys])
+
+    n = np.array([float(model.total.get(key, 0.0)) for key in keys])
+    safe = np.where(n > 0.0, n, 1.0)
+    P = C / safe[:, None]
+    mask &= (n > 0.0)[:, None]
+
+    ue = k / (k + np.maximum(n, 0.0))
+    ua = normalized_entropy_batch(P, mask)
+    return keys, {"epistemic": ue, "aleatoric": ua, "total": 0.5 * ue + 0.5 * ua}
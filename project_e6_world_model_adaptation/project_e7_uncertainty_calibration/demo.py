@@ -6,14 +6,15 @@ Demonstrates:
 - decomposing uncertainty into epistemic vs aleatoric
 - tracking calibration of confidence
 - switching exploration modes over time
+- reusing cached uncertainty for revisited states
 """
 
+import math
 import random
 
-from uncertainty_metrics import pmax
-from decomposition import decompose
 from calibration import CalibrationTracker
 from exploration_policy import choose_action_exploration
+from uncertainty_cache import UncertaintyCache
 
 from dataclasses import dataclass, field
 from typing import Dict, Tuple
@@ -26,14 +27,41 @@ Key = Tuple[Pos, str]
 class TabularTransitionModel:
     """
     Minimal tabular model for E7 demo (self-contained).
+
+    Keeps Σ c·log c and the argmax outcome per key up to date on every
+    update, so entropy / pmax queries are field reads.
     """
     counts: Dict[Key, Dict[Pos, float]] = field(default_factory=dict)
     total: Dict[Key, float] = field(default_factory=dict)
+    clogc: Dict[Key, float] = field(default_factory=dict)
+    best: Dict[Key, Tuple[Pos, float]] = field(default_factory=dict)
 
     def update(self, s: Pos, a: str, nxt: Pos):
-        self.counts.setdefault((s, a), {})
-        self.total[(s, a)] = self.total.get((s, a), 0.0) + 1.0
-        self.counts[(s, a)][nxt] = self.counts[(s, a)].get(nxt, 0.0) + 1.0
+        key = (s, a)
+        outcomes = self.counts.setdefault(key, {})
+        self.total[key] = self.total.get(key, 0.0) + 1.0
+        old = outcomes.get(nxt, 0.0)
+        new = old + 1.0
+        outcomes[nxt] = new
+
+        delta = new * math.log(new) - (old * math.log(old) if old else 0.0)
+        self.clogc[key] = self.clogc.get(key, 0.0) + delta
+
+        # ties go to the first-observed outcome, as with max() over the dict
+        cur = self.best.get(key)
+        if cur is None or new > cur[1] or nxt == cur[0]:
+            self.best[key] = (nxt, new)
+        elif new == cur[1] and list(outcomes).index(nxt) < list(outcomes).index(cur[0]):
+            self.best[key] = (nxt, new)
+
+    def entropy(self, s: Pos, a: str) -> float:
+        tot = self.total.get((s, a), 0.0)
+        if tot <= 0.0:
+            return 0.0
+        return max(0.0, math.log(tot) - self.clogc[(s, a)] / tot)
+
+    def pmax(self, s: Pos, a: str) -> float:
+        return self.most_likely(s, a)[1]
 
     def distribution(self, s: Pos, a: str):
         key = (s, a)
@@ -43,11 +71,11 @@ class TabularTransitionModel:
         return {p: c / tot for p, c in self.counts[key].items()}
 
     def most_likely(self, s: Pos, a: str):
-        dist = self.distribution(s, a)
-        if not dist:
+        key = (s, a)
+        if key not in self.best:
             return None, 0.0
-        p = max(dist, key=lambda x: dist[x])
-        return p, dist[p]
+        p, c = self.best[key]
+        return p, c / self.total[key]
 
 
 ACTIONS = ["up", "down", "left", "right", "stay"]
@@ -72,6 +100,7 @@ def main():
     random.seed(7)
 
     model = TabularTransitionModel()
+    cache = UncertaintyCache(model)
     calib = CalibrationTracker()
     state = (0, 0)
 
@@ -79,12 +108,7 @@ def main():
     print("-" * 70)
 
     for t in range(60):
-        per = {}
-        for a in ACTIONS:
-            dist = model.distribution(state, a)
-            conf = pmax(dist)
-            n = model.total.get((state, a), 0.0)
-            per[a] = {**decompose(dist, n), "confidence": conf}
+        per = cache.for_state(state, ACTIONS)
 
         mode = "curiosity" if t < 25 else "caution"
         action = choose_action_exploration(ACTIONS, per, mode=mode)
@@ -95,7 +119,7 @@ def main():
 
         nxt = synthetic_world_step(state, action)
         calib.add(conf, pred == nxt)
-        model.update(state, action, nxt)
+        cache.update(state, action, nxt)
 
         print(
             f"t={t:02d} mode={mode:9s} state={state} action={action:5s} "
@@ -107,6 +131,7 @@ def main():
     print("Calibration report:")
     for row in calib.report():
         print(row)
+    print(f"ECE={calib.ece():.3f} MCE={calib.mce():.3f} Brier={calib.brier():.3f}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,180 @@
+"""
+Bootstrap Ensemble Transition Model (Epistemic Uncertainty by Disagreement)
+
+decomposition.epistemic_uncertainty uses the count heuristic k / (k + n).
+A principled alternative is ensemble disagreement: train K models on
+bootstrap resamples of the data and measure how much they disagree.
+
+K separate dict-based models would multiply update and query cost by K.
+Instead, all K count tables live in one array:
+
+    counts[K, keys, outcomes]   totals[K, keys]
+
+Each (state, action) owns a row; each observed next position owns a column
+within that row.
+
+Online bootstrap:
+    Every observation is given an independent Poisson(1) weight per member,
+    drawn and applied to all K tables in one vectorized step.
+
+Queries return, in a single call:
+- the mean distribution across members (the model's prediction)
+- disagreement = H(mean) - mean_k H(p_k)   (Jensen-Shannon / mutual information)
+
+Members whose bootstrap never saw a key carry no opinion about it; the
+fraction of such members is folded into the epistemic score, so a key seen
+once is still uncertain.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+Pos = Tuple[int, int]
+Key = Tuple[Pos, str]
+
+
+def _row_entropy(P: np.ndarray) -> np.ndarray:
+    """
+    Entropy along the last axis, treating 0 * log 0 as 0.
+    """
+    safe = np.where(P > 0.0, P, 1.0)
+    return -(P * np.log(safe)).sum(axis=-1)
+
+
+@dataclass
+class EnsembleTabularModel:
+    """
+    K bootstrap tabular models stored as one array.
+
+    n_members:
+        ensemble size K
+    seed:
+        seed for the bootstrap weight generator
+    """
+    n_members: int = 8
+    seed: Optional[int] = None
+    rows: Dict[Key, int] = field(default_factory=dict)
+    cols: List[Dict[Pos, int]] = field(default_factory=list)
+    outcomes: List[List[Pos]] = field(default_factory=list)
+
+    def __post_init__(self):
+        self.rng = np.random.default_rng(self.seed)
+        self.counts = np.zeros((self.n_members, 16, 4), dtype=np.float64)
+        self.totals = np.zeros((self.n_members, 16), dtype=np.float64)
+
+    def _row(self, key: Key) -> int:
+        r = self.rows.get(key)
+        if r is None:
+            r = len(self.rows)
+            self.rows[key] = r
+            self.cols.append({})
+            self.outcomes.append([])
+            if r >= self.counts.shape[1]:
+                grow = self.counts.shape[1]
+                self.counts = np.concatenate([self.counts, np.zeros_like(self.counts[:, :grow])], axis=1)
+                self.totals = np.concatenate([self.totals, np.zeros_like(self.totals[:, :grow])], axis=1)
+        return r
+
+    def _col(self, r: int, nxt: Pos) -> int:
+        c = self.cols[r].get(nxt)
+        if c is None:
+            c = len(self.cols[r])
+            self.cols[r][nxt] = c
+            self.outcomes[r].append(nxt)
+            if c >= self.counts.shape[2]:
+                grow = self.counts.shape[2]
+                self.counts = np.concatenate([self.counts, np.zeros_like(self.counts[:, :, :grow])], axis=2)
+        return c
+
+    def update(self, s: Pos, a: str, nxt: Pos, weight: float = 1.0) -> None:
+        """
+        Adds one observation to every member with Poisson(1) bootstrap weights.
+        """
+        r = self._row((s, a))
+        c = self._col(r, nxt)
+        w = self.rng.poisson(1.0, self.n_members) * float(weight)
+        self.counts[:, r, c] += w
+        self.totals[:, r] += w
+
+    def update_many(self, transitions: List[Tuple[Pos, str, Pos]]) -> None:
+        """
+        Adds a batch of (state, action, next_pos) observations at once.
+        """
+        if not transitions:
+            return
+        r = np.array([self._row((s, a)) for s, a, _ in transitions], dtype=np.int64)
+        c = np.array([self._col(int(ri), t[2]) for ri, t in zip(r, transitions)], dtype=np.int64)
+        w = self.rng.poisson(1.0, (self.n_members, len(transitions))).astype(np.float64)
+        k = np.arange(self.n_members)[:, None]
+        np.add.at(self.counts, (k, r[None, :], c[None, :]), w)
+        np.add.at(self.totals, (k, r[None, :]), w)
+
+    def _member_dists(self, r: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Per-member distributions [K, n_outcomes] and a has-data mask [K].
+        """
+        n = len(self.outcomes[r])
+        C = self.counts[:, r, :n]
+        T = self.totals[:, r]
+        has = T > 0.0
+        P = C / np.where(has, T, 1.0)[:, None]
+        return P, has
+
+    def query(self, s: Pos, a: str) -> Dict[str, object]:
+        """
+        Mean distribution and disagreement for one (state, action).
+
+        Returns:
+            {
+              "distribution": {next_pos: mean probability},
+              "disagreement": JSD across members with data (nats),
+              "coverage": fraction of members that saw this key,
+              "epistemic": (1 - coverage) + coverage * normalized JSD,
+            }
+        """
+        r = self.rows.get((s, a))
+        if r is None:
+            return {"distribution": {}, "disagreement": 0.0, "coverage": 0.0, "epistemic": 1.0}
+
+        P, has = self._member_dists(r)
+        coverage = float(has.mean())
+        if not has.any():
+            return {"distribution": {}, "disagreement": 0.0, "coverage": 0.0, "epistemic": 1.0}
+
+        Ph = P[has]
+        mean = Ph.mean(axis=0)
+        jsd = float(max(0.0, _row_entropy(mean) - _row_entropy(Ph).mean()))
+        n_out = len(self.outcomes[r])
+        norm = jsd / np.log(n_out) if n_out > 1 else 0.0
+        return {
+            "distribution": {p: float(mean[i]) for i, p in enumerate(self.outcomes[r])},
+            "disagreement": jsd,
+            "coverage": coverage,
+            "epistemic": float((1.0 - coverage) + coverage * norm),
+        }
+
+    def disagreement_many(self, keys: Optional[List[Key]] = None) -> Tuple[List[Key], np.ndarray, np.ndarray]:
+        """
+        Vectorized disagreement and coverage for many keys.
+
+        Returns:
+            (keys, disagreement [N], coverage [N])
+        """
+        if keys is None:
+            keys = list(self.rows)
+        idx = np.array([self.rows.get(k, -1) for k in keys], dtype=np.int64)
+        known = idx >= 0
+        rows = np.where(known, idx, 0)
+
+        C = self.counts[:, rows, :]                  # [K, N, W]
+        T = self.totals[:, rows]                     # [K, N]
+        has = (T > 0.0) & known[None, :]
+        P = C / np.where(has, T, 1.0)[:, :, None]
+        m = has.sum(axis=0)                          # members with data [N]
+        mean = (P * has[:, :, None]).sum(axis=0) / np.maximum(m, 1)[:, None]
+        member_h = (_row_entropy(P) * has).sum(axis=0) / np.maximum(m, 1)
+        jsd = np.maximum(0.0, _row_entropy(mean) - member_h)
+        jsd = np.where(m > 0, jsd, 0.0)
+        return keys, jsd, m / float(self.n_members)
@@ -5,13 +5,15 @@ Defines strategies that use epistemic and aleatoric uncertainty
 to guide action selection.
 """
 
-from typing import Dict, List
+from typing import Dict, List, Union
 import random
 
+from uncertainty_cache import StateUncertainty
+
 
 def choose_action_exploration(
     actions: List[str],
-    per_action_uncertainty: Dict[str, Dict[str, float]],
+    per_action_uncertainty: Union[Dict[str, Dict[str, float]], StateUncertainty],
     mode: str = "curiosity",
 ) -> str:
     """
@@ -21,12 +23,26 @@ def choose_action_exploration(
         - curiosity: maximize epistemic uncertainty (learn unknowns)
         - caution: minimize total uncertainty (be safe)
         - robust: avoid aleatoric noise first, then total uncertainty
+
+    per_action_uncertainty may be a plain dict or a cached StateUncertainty
+    record. For a cached record the deterministic choice is memoized on the
+    record, so revisiting an unchanged state costs one lookup.
     """
     if not actions:
         return "stay"
 
     mode = mode.lower()
 
+    if isinstance(per_action_uncertainty, StateUncertainty):
+        record = per_action_uncertainty
+        if mode not in ("curiosity", "caution", "robust") or record.actions != tuple(actions):
+            return choose_action_exploration(actions, record.per_action, mode)
+        choice = record.choice.get(mode)
+        if choice is None:
+            choice = choose_action_exploration(actions, record.per_action, mode)
+            record.choice[mode] = choice
+        return choice
+
     if mode == "curiosity":
         return max(
             actions,
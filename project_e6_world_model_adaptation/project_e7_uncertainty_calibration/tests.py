@@ -5,10 +5,30 @@ Validates:
 - entropy behavior
 - epistemic decay with sample count
 - aleatoric increase with stochasticity
+- batched metrics / decompose_many agree with the per-dict versions
+- calibration tracker: add / add_many / merge agree, ECE and Brier values
+- rolling calibration: windowed ECE matches a fresh tracker, drift fires
+- uncertainty cache: reuses records, invalidates on update
+- bootstrap ensemble: disagreement shrinks with data, batch == scalar queries
 """
 
-from uncertainty_metrics import entropy, normalized_entropy
-from decomposition import epistemic_uncertainty, aleatoric_uncertainty
+from uncertainty_metrics import (
+    entropy,
+    normalized_entropy,
+    pmax,
+    effective_outcomes,
+    pad_distributions,
+    entropy_batch,
+    normalized_entropy_batch,
+    pmax_batch,
+    effective_outcomes_batch,
+)
+from decomposition import epistemic_uncertainty, aleatoric_uncertainty, decompose, decompose_many, decompose_stats
+from calibration import CalibrationTracker, RollingCalibrationTracker
+from exploration_policy import choose_action_exploration
+from uncertainty_cache import UncertaintyCache
+from ensemble_model import EnsembleTabularModel
+from demo import TabularTransitionModel
 
 
 def test_entropy():
@@ -24,7 +44,128 @@ def test_uncertainty_components():
     assert aleatoric_uncertainty(dist_mix) > aleatoric_uncertainty(dist_det)
 
 
+def test_batched_metrics_match_scalar():
+    dists = [{}, {(0, 0): 1.0}, {(0, 0): 0.5, (1, 0): 0.5}, {(0, 0): 0.2, (1, 0): 0.3, (2, 0): 0.5}]
+    P, mask = pad_distributions(dists)
+
+    for fn, batch in [
+        (entropy, entropy_batch),
+        (normalized_entropy, normalized_entropy_batch),
+        (pmax, pmax_batch),
+        (effective_outcomes, effective_outcomes_batch),
+    ]:
+        got = batch(P, mask)
+        for i, d in enumerate(dists):
+            assert abs(got[i] - fn(d)) < 1e-9
+
+
+def test_decompose_many_matches_decompose():
+    model = TabularTransitionModel()
+    model.update((0, 0), "right", (1, 0))
+    model.update((0, 0), "right", (0, 0))
+    model.update((0, 0), "up", (0, 0))
+
+    keys, out = decompose_many(model, list(model.counts) + [((9, 9), "up")])
+    for i, (s, a) in enumerate(keys):
+        ref = decompose(model.distribution(s, a), model.total.get((s, a), 0.0))
+        stats = decompose_stats(model.entropy(s, a), len(model.counts.get((s, a), ())), model.total.get((s, a), 0.0))
+        for name in ("epistemic", "aleatoric", "total"):
+            assert abs(out[name][i] - ref[name]) < 1e-9
+            assert abs(stats[name] - ref[name]) < 1e-9
+
+
+def test_calibration_tracker_batch_and_merge():
+    conf = [0.05, 0.95, 0.95, 0.55, 1.0, 0.3]
+    hit = [False, True, False, True, True, False]
+
+    a = CalibrationTracker(n_bins=5)
+    for c, y in zip(conf, hit):
+        a.add(c, y)
+
+    b = CalibrationTracker(n_bins=5)
+    b.add_many(conf[:3], hit[:3])
+    c = CalibrationTracker(n_bins=5)
+    c.add_many(conf[3:], hit[3:])
+    b.merge(c)
+
+    assert a.report() == b.report()
+    assert abs(a.ece() - b.ece()) < 1e-12 and abs(a.brier() - b.brier()) < 1e-12
+
+    # bin gaps: 0.05, 0.3, 0.45 (one sample each) and 0.3 (three samples)
+    assert abs(a.ece() - (0.05 + 0.3 + 0.45 + 3 * 0.3) / 6.0) < 1e-9
+    assert abs(a.mce() - 0.45) < 1e-9
+    assert abs(a.brier() - 0.2) < 1e-9
+
+
+def test_rolling_calibration_window_and_drift():
+    rolling = RollingCalibrationTracker(window=20, drift_threshold=0.3, min_samples=10)
+
+    # well calibrated: confident and right
+    for _ in range(50):
+        assert not rolling.add(0.95, True)
+
+    # the world changes: still confident, now always wrong
+    signals = [rolling.add(0.95, False) for _ in range(30)]
+    assert any(signals) and rolling.drift_events == 1
+
+    # only the last 20 outcomes count
+    fresh = CalibrationTracker()
+    for _ in range(20):
+        fresh.add(0.95, False)
+    assert abs(rolling.ece() - fresh.ece()) < 1e-9
+
+    decayed = RollingCalibrationTracker(half_life=5.0, min_samples=1.0)
+    for _ in range(5000):
+        decayed.add(0.5, True)
+    assert abs(decayed.ece() - 0.5) < 1e-9
+
+
+def test_uncertainty_cache_invalidation():
+    actions = ["left", "right"]
+    model = TabularTransitionModel()
+    cache = UncertaintyCache(model)
+
+    rec = cache.for_state((0, 0), actions)
+    assert cache.for_state((0, 0), actions) is rec
+    assert choose_action_exploration(actions, rec, "caution") == "left"
+
+    cache.update((0, 0), "left", (0, 0))
+    cache.update((0, 0), "left", (1, 0))
+    rec2 = cache.for_state((0, 0), actions)
+    assert rec2 is not rec
+    expected = decompose(model.distribution((0, 0), "left"), 2.0)
+    assert abs(rec2.get("left")["aleatoric"] - expected["aleatoric"]) < 1e-9
+    assert choose_action_exploration(actions, rec2, "curiosity") == \
+        choose_action_exploration(actions, rec2.per_action, "curiosity") == "right"
+
+
+def test_ensemble_disagreement():
+    ens = EnsembleTabularModel(n_members=16, seed=0)
+
+    ens.update((0, 0), "right", (1, 0))
+    ens.update((0, 0), "right", (0, 0))
+    few = ens.query((0, 0), "right")
+
+    ens.update_many([((0, 0), "right", (1, 0)), ((0, 0), "right", (0, 0))] * 200)
+    many = ens.query((0, 0), "right")
+
+    assert ens.query((5, 5), "up")["epistemic"] == 1.0
+    assert many["epistemic"] < few["epistemic"]
+    assert abs(sum(many["distribution"].values()) - 1.0) < 1e-9
+    assert abs(many["distribution"][(1, 0)] - 0.5) < 0.1
+
+    keys, jsd, coverage = ens.disagreement_many([((0, 0), "right"), ((5, 5), "up")])
+    assert abs(jsd[0] - many["disagreement"]) < 1e-9 and abs(coverage[0] - many["coverage"]) < 1e-9
+    assert jsd[1] == 0.0 and coverage[1] == 0.0
+
+
 if __name__ == "__main__":
     test_entropy()
     test_uncertainty_components()
+    test_batched_metrics_match_scalar()
+    test_decompose_many_matches_decompose()
+    test_calibration_tracker_batch_and_merge()
+    test_rolling_calibration_window_and_drift()
+    test_uncertainty_cache_invalidation()
+    test_ensemble_disagreement()
     print("✅ tests passed")
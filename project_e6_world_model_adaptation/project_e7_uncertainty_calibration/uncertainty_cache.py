@@ -0,0 +1,115 @@
+"""
+Uncertainty Cache (Decomposed Uncertainty per State)
+
+The E7 loop decomposes uncertainty for every action on every step, even
+for states whose statistics have not changed since the last visit.
+
+This module caches the decomposed record per (state, action):
+    {"epistemic", "aleatoric", "total", "confidence"}
+
+A record is recomputed only after the model updates that key. Updates go
+through UncertaintyCache.update(), which forwards to the model and
+invalidates the key, so the cache can never serve stale values.
+
+Records are grouped per state as StateUncertainty, which also memoizes the
+action chosen for each exploration mode. For agents revisiting known
+states, action selection becomes a dictionary lookup.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from decomposition import decompose_stats
+
+Pos = Tuple[int, int]
+Key = Tuple[Pos, str]
+Record = Dict[str, float]
+
+
+@dataclass
+class StateUncertainty:
+    """
+    Cached uncertainty for all actions of one state.
+
+    per_action:
+        action -> decomposed record
+    choice:
+        mode -> memoized action choice (filled by choose_action_exploration)
+    """
+    actions: Tuple[str, ...]
+    per_action: Dict[str, Record]
+    choice: Dict[str, str] = field(default_factory=dict)
+
+    def get(self, action: str, default=None):
+        return self.per_action.get(action, default)
+
+
+@dataclass
+class UncertaintyCache:
+    """
+    Per-(state, action) cache of decomposed uncertainty.
+
+    model must expose counts / total dicts plus entropy(s, a) and pmax(s, a),
+    as the tabular models in E6 and the E7 demo do.
+    """
+    model: object
+    records: Dict[Key, Record] = field(default_factory=dict)
+    states: Dict[Pos, StateUncertainty] = field(default_factory=dict)
+    hits: int = 0
+    misses: int = 0
+
+    def _compute(self, s: Pos, a: str) -> Record:
+        key = (s, a)
+        n = self.model.total.get(key, 0.0)
+        k = len(self.model.counts.get(key, ()))
+        rec = decompose_stats(self.model.entropy(s, a), k, n)
+        rec["confidence"] = self.model.pmax(s, a)
+        return rec
+
+    def get(self, s: Pos, a: str) -> Record:
+        """
+        Decomposed record for one (state, action).
+        """
+        key = (s, a)
+        rec = self.records.get(key)
+        if rec is None:
+            self.misses += 1
+            rec = self._compute(s, a)
+            self.records[key] = rec
+        else:
+            self.hits += 1
+        return rec
+
+    def for_state(self, s: Pos, actions: List[str]) -> StateUncertainty:
+        """
+        Cached per-action records for a state, ready for
+        choose_action_exploration.
+        """
+        st = self.states.get(s)
+        if st is not None and st.actions == tuple(actions):
+            self.hits += len(actions)
+            return st
+        st = StateUncertainty(
+            actions=tuple(actions),
+            per_action={a: self.get(s, a) for a in actions},
+        )
+        self.states[s] = st
+        return st
+
+    def invalidate(self, s: Pos, a: Optional[str] = None) -> None:
+        """
+        Drops cached values for (s, a), or for every action of s.
+        """
+        if a is None:
+            for key in [k for k in self.records if k[0] == s]:
+                del self.records[key]
+        else:
+            self.records.pop((s, a), None)
+        self.states.pop(s, None)
+
+    def update(self, s: Pos, a: str, nxt: Pos, *args, **kwargs) -> None:
+        """
+        Updates the model and invalidates the affected key.
+        """
+        self.model.update(s, a, nxt, *args, **kwargs)
+        self.invalidate(s, a)
@@ -6,11 +6,18 @@ learned transition distributions.
 
 These metrics are model-agnostic and operate purely on probability
 distributions, making them reusable across planners and environments.
+
+Each metric has a batched *_batch form that operates on a padded
+probability matrix P of shape [N, K] plus a boolean mask of the same shape
+(True where an outcome exists). These return NumPy arrays of shape [N] and
+are meant for whole-map queries (heatmaps, decompose_many).
 """
 
-from typing import Dict, Tuple
+from typing import Dict, List, Optional, Tuple
 import math
 
+import numpy as np
+
 Pos = Tuple[int, int]
 
 
@@ -72,3 +79,78 @@ def effective_outcomes(dist: Dict[Pos, float], eps: float = 1e-12) -> float:
         how many equally-likely outcomes would produce the same entropy
     """
     return float(math.exp(entropy(dist, eps=eps)))
+
+
+def pad_distributions(dists: List[Dict[Pos, float]]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Packs a list of distributions (or raw count dicts) into a padded matrix.
+
+    Returns:
+        (P, mask) with shape [N, K], K = largest support size.
+    """
+    k = max((len(d) for d in dists), default=0)
+    P = np.zeros((len(dists), k), dtype=np.float64)
+    mask = np.zeros((len(dists), k), dtype=bool)
+    for i, d in enumerate(dists):
+        n = len(d)
+        if n:
+            P[i, :n] = list(d.values())
+            mask[i, :n] = True
+    return P, mask
+
+
+def _support(P: np.ndarray, mask: Optional[np.ndarray]) -> np.ndarray:
+    return mask if mask is not None else (P > 0.0)
+
+
+def entropy_batch(P: np.ndarray, mask: Optional[np.ndarray] = None, eps: float = 1e-12) -> np.ndarray:
+    """
+    Row-wise Shannon entropy of a padded [N, K] probability matrix.
+
+    Matches entropy() on each row: padded and zero entries contribute 0.
+    """
+    P = np.asarray(P, dtype=np.float64)
+    live = _support(P, mask) & (P > 0.0)
+    terms = np.where(live, P * np.log(np.where(live, P, 1.0) + eps), 0.0)
+    return -terms.sum(axis=1)
+
+
+def pmax_batch(P: np.ndarray, mask: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Row-wise maximum probability. Empty rows give 0.
+    """
+    P = np.asarray(P, dtype=np.float64)
+    if P.shape[1] == 0:
+        return np.zeros(P.shape[0])
+    return np.where(_support(P, mask), P, 0.0).max(axis=1)
+
+
+def normalized_entropy_batch(
+    P: np.ndarray,
+    mask: Optional[np.ndarray] = None,
+    eps: float = 1e-12,
+) -> np.ndarray:
+    """
+    Row-wise normalized entropy in [0, 1].
+
+    K per row is the number of masked outcomes; rows with K <= 1 give 0.
+    """
+    P = np.asarray(P, dtype=np.float64)
+    if mask is None:
+        k = np.count_nonzero(P, axis=1)
+    else:
+        k = np.count_nonzero(mask, axis=1)
+    h = entropy_batch(P, mask, eps=eps)
+    denom = np.log(np.maximum(k, 1)) + eps
+    return np.where(k > 1, h / denom, 0.0)
+
+
+def effective_outcomes_batch(
+    P: np.ndarray,
+    mask: Optional[np.ndarray] = None,
+    eps: float = 1e-12,
+) -> np.ndarray:
+    """
+    Row-wise perplexity exp(H).
+    """
+    return np.exp(entropy_batch(P, mask, eps=eps))
@@ -13,6 +13,15 @@ Reused from earlier projects with no behavioral changes.
 
 from dataclasses import dataclass, field
 from typing import List, Tuple, Dict, Any
+import math
+
+from transition_model_tabular import TabularTransitionModel
+from action_space import ACTIONS, ActionSpace, action_id, RIGHT
+from belief_fallback_model import fallback_predict_next
+from env_gridworld import GridworldEnv
+from vector_env import VectorGridworldEnv
+from world_generator import random_obstacles, maze, rooms
+import numpy as np
 
 Pos = Tuple[int, int]
 
@@ -60,3 +69,214 @@ def update_known_from_truth(known_map, truth_grid, visible_cells):
             known_map[y][x] = "goal"
         else:
             known_map[y][x] = "empty"
+
+
+def test_running_entropy_and_pmax():
+    model = TabularTransitionModel()
+    for nxt, w in [((1, 0), 1.0), ((0, 0), 2.0), ((1, 0), 1.0), ((2, 0), 0.5)]:
+        model.update((0, 0), "right", nxt, weight=w)
+
+    dist = model.distribution((0, 0), "right")
+    h_ref = -sum(p * math.log(p) for p in dist.values())
+    assert abs(model.entropy((0, 0), "right") - h_ref) < 1e-9
+
+    # (1, 0) and (0, 0) tie at 2.0; the first-observed outcome wins, as with max()
+    best, p = model.most_likely((0, 0), "right")
+    assert best == max(dist, key=lambda k: dist[k]) == (1, 0)
+    assert abs(p - 2.0 / 4.5) < 1e-9
+    assert model.most_likely((5, 5), "up") == (None, 0.0)
+
+
+def test_integer_action_ids_and_custom_space():
+    grid = [list("..."), list(".#."), list("...")]
+    known = [["empty"] * 3 for _ in range(3)]
+    known[1][1] = "obstacle"
+    ws = SimpleWorldState(grid_size=(3, 3), agent_pos=(0, 1), known_map=known)
+
+    # names and ids are interchangeable
+    for a in ACTIONS:
+        env_s, env_i = GridworldEnv(grid, (0, 1)), GridworldEnv(grid, (0, 1))
+        assert env_s.step(a) == env_i.step(action_id(a))
+        assert fallback_predict_next(ws, a) == fallback_predict_next(ws, action_id(a))
+    assert fallback_predict_next(ws, RIGHT) == (0, 1)
+
+    # a custom action set needs no changes to the dynamics
+    space = ActionSpace(ACTIONS, [(0, -1), (0, 1), (-1, 0), (1, 0), (0, 0)])
+    diag = space.register("down_right", (1, 1))
+    assert fallback_predict_next(ws, "down_right", space) == (1, 2)
+    env = GridworldEnv(grid, (0, 1), action_space=space)
+    assert env.step(diag)[0] == (1, 2)
+    assert env.step(space.id("up"))[0] == (1, 2)  # blocked by the obstacle
+
+    for bad in ("jump", 99, -1):
+        try:
+            fallback_predict_next(ws, bad)
+            assert False
+        except ValueError:
+            pass
+
+    # ids must be integers: 1.5 is not an action
+    assert space.id(np.int64(2)) == 2
+    for bad in (1.5, 2.0, None):
+        try:
+            space.id(bad)
+            assert False
+        except ValueError:
+            pass
+
+
+def test_vector_env_matches_single_envs():
+    rng = np.random.default_rng(0)
+    grids = []
+    for _ in range(16):
+        g = [["#" if rng.random() < 0.25 else "." for _ in range(7)] for _ in range(5)]
+        g[0][0], g[4][6] = ".", "G"
+        grids.append(g)
+
+    venv = VectorGridworldEnv(grids, starts=(0, 0), auto_reset=False)
+    envs = [GridworldEnv([row[:] for row in g], (0, 0)) for g in grids]
+    for _ in range(60):
+        actions = rng.integers(0, len(ACTIONS), size=len(envs))
+        pos, reward, done = venv.step(actions)
+        for i, env in enumerate(envs):
+            p, info = env.step(int(actions[i]))
+            assert tuple(pos[i]) == p and reward[i] == info["reward"] and done[i] == (reward[i] > 0)
+
+    # auto-reset: terminal position is reported, the next step starts over
+    venv = VectorGridworldEnv([[list(".G")]] * 2, starts=[(0, 0), (0, 0)], max_steps=5)
+    pos, reward, done = venv.step([action_id("right"), action_id("stay")])
+    assert tuple(pos[0]) == (1, 0) and reward.tolist() == [1.0, 0.0] and done.tolist() == [True, False]
+    assert venv.positions.tolist() == [[0, 0], [0, 0]] and venv.t.tolist() == [0, 1]
+
+
+def test_snapshot_restore():
+    grid = [list(".#"), list(".G")]
+    env = GridworldEnv(grid, (0, 0))
+    token = env.snapshot()
+    env.set_cell((1, 0), ".")
+    assert env.step("right")[0] == (1, 0)
+    env.restore(token)
+    assert env.agent_pos == (0, 0) and env.is_obstacle((1, 0))
+
+    # commit() keeps the edits and empties the journal; earlier tokens go stale
+    base = env.snapshot()
+    for _ in range(9):
+        env.set_cell((1, 0), "." if env.is_obstacle((1, 0)) else "#")
+    token = env.snapshot()
+    env.commit()
+    assert not env._journal and not env.is_obstacle((1, 0))
+    env.set_cell((1, 0), "#")
+    assert not env._journal
+    env.snapshot()
+    env.set_cell((1, 0), ".")
+    for stale in (token, base):
+        try:
+            env.restore(stale)
+            assert False
+        except ValueError:
+            pass
+    assert not env.is_obstacle((1, 0))
+
+    venv = VectorGridworldEnv([grid] * 3, starts=(0, 0), random_start=True, max_steps=2)
+    token = venv.snapshot()
+    first = [venv.step([action_id("down")] * 3) for _ in range(4)]
+    venv.restore(token)
+    again = [venv.step([action_id("down")] * 3) for _ in range(4)]
+    for a, b in zip(first, again):
+        assert all((u == v).all() for u, v in zip(a, b))
+
+    # random resets draw uniformly from each world's own free cells
+    worlds = np.ones((2, 3, 3), dtype=np.uint8)
+    worlds[0, 0, :] = 0
+    worlds[1, :, 2] = 0
+    venv = VectorGridworldEnv(worlds, starts=[(0, 0), (2, 0)], random_start=True, seeds=[1, 2])
+    seen = [set(), set()]
+    for _ in range(200):
+        for i, (x, y) in enumerate(venv.reset()):
+            seen[i].add((int(x), int(y)))
+    assert seen == [{(0, 0), (1, 0), (2, 0)}, {(2, 0), (2, 1), (2, 2)}]
+
+
+def test_vector_env_slip():
+    world = np.zeros((1, 3, 3), dtype=np.uint8)
+    slip = np.zeros((3, 3))
+    slip[1, 1] = 0.3
+    n = 20000
+    venv = VectorGridworldEnv(np.repeat(world, n, axis=0), starts=(1, 1), slip=slip, slip_seed=0)
+
+    pos, _, _ = venv.step(np.full(n, action_id("right")))
+    moved = np.bincount(pos[:, 1] * 3 + pos[:, 0], minlength=9)
+    # 70% go right; slips spread 30% evenly over the 5 actions
+    assert abs(moved[1 * 3 + 2] / n - (0.7 + 0.3 / 5)) < 0.02
+    for cell in ((1, 0), (1, 2), (0, 1), (1, 1)):
+        assert abs(moved[cell[1] * 3 + cell[0]] / n - 0.3 / 5) < 0.01
+
+    # no slip outside the slippery cell
+    off = (pos != (1, 1)).any(axis=1)
+    after, _, _ = venv.step(np.full(n, action_id("stay")))
+    assert (after[off] == pos[off]).all()
+
+    # scalar slip: same rates, drawn only for the envs that slip
+    venv = VectorGridworldEnv(np.repeat(world, n, axis=0), starts=(1, 1), slip=0.3, slip_seed=0)
+    pos, _, _ = venv.step(np.full(n, action_id("right")))
+    assert abs((pos[:, 0] == 2).mean() - (0.7 + 0.3 / 5)) < 0.02
+
+    # slip=0 is the deterministic path and never touches the generator
+    venv = VectorGridworldEnv(np.repeat(world, 4, axis=0), starts=(1, 1), slip=0.0, slip_seed=0)
+    state = venv.rng.bit_generator.state
+    assert (venv.step(np.full(4, action_id("right")))[0] == (2, 1)).all()
+    assert venv.rng.bit_generator.state == state
+
+
+def _reachable_cells(blocked, start):
+    h, w = blocked.shape
+    seen = np.zeros_like(blocked)
+    seen[start[1], start[0]] = True
+    stack = [start]
+    while stack:
+        x, y = stack.pop()
+        for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < w and 0 <= ny < h and not seen[ny, nx] and not blocked[ny, nx]:
+                seen[ny, nx] = True
+                stack.append((nx, ny))
+    return seen
+
+
+def test_world_generator():
+    for seed in range(10):
+        for w, h in [(7, 5), (8, 6), (33, 20)]:
+            dense = random_obstacles(w, h, density=0.45, seed=seed)
+            assert _reachable_cells(dense.blocked, dense.start)[dense.goal[1], dense.goal[0]]
+            for world in (maze(w, h, seed=seed), rooms(w, h, room_size=3, seed=seed)):
+                # connected by construction: every free cell is reachable
+                assert (_reachable_cells(world.blocked, world.start) | world.blocked).all()
+
+    a, b = maze(21, 11, seed=3), maze(21, 11, seed=3)
+    assert (a.cells == b.cells).all() and a.goal == b.goal
+
+    env = GridworldEnv(a.to_grid(), a.start)
+    assert env.size == (21, 11) and env.cell(a.goal) == "G"
+    venv = VectorGridworldEnv(np.stack([a.cells, b.cells]), starts=[a.start, b.start])
+    assert venv.positions.tolist() == [list(a.start), list(b.start)]
+
+    # full density still carves start -> goal; maps without two free cells raise
+    full = random_obstacles(9, 7, density=1.0, seed=1)
+    assert full.start != full.goal
+    assert _reachable_cells(full.blocked, full.start)[full.goal[1], full.goal[0]]
+    for make in (lambda: maze(2, 2), lambda: maze(1, 1), lambda: rooms(2, 2, room_size=1), lambda: random_obstacles(1, 1)):
+        try:
+            make()
+            assert False
+        except ValueError:
+            pass
+
+
+if __name__ == "__main__":
+    test_running_entropy_and_pmax()
+    test_integer_action_ids_and_custom_space()
+    test_vector_env_matches_single_envs()
+    test_snapshot_restore()
+    test_vector_env_slip()
+    test_world_generator()
+    print("✅ tests passed")
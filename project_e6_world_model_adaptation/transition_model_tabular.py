@@ -9,16 +9,27 @@ The model is updated online from real experience and used by imagination
 rollouts to predict future states probabilistically.
 
 This replaces the fixed belief transition model used in E4.
+
+Uncertainty statistics are maintained incrementally on every update:
+- Σ c·log c per key, so entropy is a closed-form field read
+- the current argmax outcome and its count, so pmax needs no scan
+
+With positive weights these stay exact and cost O(1) per update.
 """
 
 from dataclasses import dataclass, field
 from typing import Dict, Tuple
+import math
 import random
 
 Pos = Tuple[int, int]
 Key = Tuple[Pos, str]
 
 
+def _clogc(c: float) -> float:
+    return c * math.log(c) if c > 0.0 else 0.0
+
+
 @dataclass
 class TabularTransitionModel:
     """
@@ -31,25 +42,59 @@ class TabularTransitionModel:
     - interpretability
     - stability
     - fast online updates
+
+    Running statistics:
+        clogc: (state, action) -> Σ c·log c over outcome counts
+        best:  (state, action) -> (argmax next_pos, its count)
     """
     counts: Dict[Key, Dict[Pos, float]] = field(default_factory=dict)
     total: Dict[Key, float] = field(default_factory=dict)
     alpha: float = 0.1  # smoothing for numerical stability
+    clogc: Dict[Key, float] = field(default_factory=dict)
+    best: Dict[Key, Tuple[Pos, float]] = field(default_factory=dict)
 
     def update(self, state_pos: Pos, action: str, actual_next_pos: Pos, weight: float = 1.0) -> None:
         """
         Updates the transition counts using observed outcome.
 
         weight allows stronger updates for surprising events.
+
+        Entropy and argmax statistics are updated in O(1) alongside counts.
         """
         key = (state_pos, action)
         if key not in self.counts:
             self.counts[key] = {}
             self.total[key] = 0.0
+            self.clogc[key] = 0.0
 
-        self.counts[key][actual_next_pos] = self.counts[key].get(actual_next_pos, 0.0) + weight
+        outcomes = self.counts[key]
+        old = outcomes.get(actual_next_pos, 0.0)
+        new = old + weight
+        outcomes[actual_next_pos] = new
         self.total[key] += weight
 
+        self.clogc[key] += _clogc(new) - _clogc(old)
+        self._update_best(key, actual_next_pos, new)
+
+    def _update_best(self, key: Key, pos: Pos, c: float) -> None:
+        """
+        Keeps best[key] equal to what max() over counts[key] would return.
+
+        Ties go to the outcome observed first, as with max() over the dict.
+        """
+        cur = self.best.get(key)
+        if cur is None or c > cur[1]:
+            self.best[key] = (pos, c)
+            return
+        best_pos, best_c = cur
+        if pos == best_pos:
+            self.best[key] = (pos, c)
+        elif c == best_c:
+            for p in self.counts[key]:
+                if p == pos or p == best_pos:
+                    self.best[key] = (p, c)
+                    return
+
     def distribution(self, state_pos: Pos, action: str) -> Dict[Pos, float]:
         """
         Returns P(next_pos | state_pos, action).
@@ -67,11 +112,38 @@ class TabularTransitionModel:
         """
         Returns the most likely next state and its probability.
         """
-        dist = self.distribution(state_pos, action)
-        if not dist:
+        key = (state_pos, action)
+        tot = self.total.get(key, 0.0)
+        if tot == 0.0 or key not in self.best:
             return None, 0.0
-        pos = max(dist.keys(), key=lambda p: dist[p])
-        return pos, dist[pos]
+        pos, c = self.best[key]
+        return pos, c / tot
+
+    def pmax(self, state_pos: Pos, action: str) -> float:
+        """
+        Probability of the most likely outcome (0.0 if unseen).
+        """
+        return self.most_likely(state_pos, action)[1]
+
+    def entropy(self, state_pos: Pos, action: str) -> float:
+        """
+        Shannon entropy of P(next_pos | state_pos, action).
+
+        Uses H = log T - (Σ c·log c) / T, so no distribution is built.
+        Returns 0.0 if unseen.
+        """
+        key = (state_pos, action)
+        tot = self.total.get(key, 0.0)
+        if tot <= 0.0:
+            return 0.0
+        h = math.log(tot) - self.clogc[key] / tot
+        return h if h > 0.0 else 0.0
+
+    def num_outcomes(self, state_pos: Pos, action: str) -> int:
+        """
+        Number of distinct observed next positions.
+        """
+        return len(self.counts.get((state_pos, action), ()))
 
     def sample_next(self, state_pos: Pos, action: str, fallback_next: Pos) -> Pos:
         """
@@ -0,0 +1,229 @@
+"""
+Vectorized Gridworld Environment (B Worlds per Step)
+
+GridworldEnv steps one agent in one world with Python branching, which
+bounds how fast experience can be collected for model learning.
+
+VectorGridworldEnv holds B worlds as one array
+
+    cells[B, H, W]   EMPTY / OBSTACLE / GOAL
+
+plus agent position arrays x[B], y[B], and steps all of them with a few
+array operations per call. Per-env dynamics are exactly GridworldEnv.step:
+- moves outside the grid or into obstacles leave the agent in place
+- reward is 1.0 when the agent stands on a goal cell
+
+Episodes end on reaching a goal or after max_steps. With auto_reset, ended
+envs are reset in the same call: step() returns their terminal positions
+and rewards, and the next call continues from the start position (or a
+uniformly random free cell: free cells are indexed once per world, and all
+resets of a call share one vectorized draw from a seeded generator).
+
+Actions are integer ids from action_space.
+
+Stochastic mode:
+    With `slip` set (a probability, an [H, W] map or a [B, H, W] map), an
+    agent on cell c ignores its action with probability slip[c] and takes a
+    uniformly random action instead (a random neighbour, or staying put).
+    Slips for all envs are drawn from one NumPy Generator per call. Only
+    envs that can slip draw a number, and only envs that slipped draw a
+    replacement action; slip=0 takes the deterministic path.
+
+snapshot() copies only the per-env state arrays (positions, step counters,
+generator states, including the slip generator); the world array is shared.
+"""
+
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from action_space import ActionSpace, DEFAULT_ACTION_SPACE
+
+EMPTY, OBSTACLE, GOAL = 0, 1, 2
+
+_CODES = {".": EMPTY, "#": OBSTACLE, "G": GOAL}
+
+
+def encode_grid(grid: List[List[str]]) -> np.ndarray:
+    """
+    '.' / '#' / 'G' list-of-lists grid -> uint8 [H, W] array.
+    """
+    return np.array([[_CODES[c] for c in row] for row in grid], dtype=np.uint8)
+
+
+class VectorGridworldEnv:
+    """
+    B independent gridworlds stepped in lockstep.
+
+    worlds:
+        [B, H, W] uint8 array of cell codes, or a list of B '.'/'#'/'G'
+        grids of equal size
+    starts:
+        [B, 2] start positions (x, y), or one (x, y) shared by all envs
+    seeds:
+        seeds of the random_start reset generator (one per env, combined
+        into a single seed sequence)
+    slip / slip_seed:
+        per-cell slip probability and the seed of the batch generator
+    """
+
+    def __init__(
+        self,
+        worlds,
+        starts,
+        seeds: Optional[Sequence[int]] = None,
+        max_steps: Optional[int] = None,
+        auto_reset: bool = True,
+        random_start: bool = False,
+        action_space: ActionSpace = DEFAULT_ACTION_SPACE,
+        slip=None,
+        slip_seed: Optional[int] = None,
+    ):
+        if isinstance(worlds, np.ndarray):
+            cells = worlds.astype(np.uint8, copy=False)
+        else:
+            cells = np.stack([encode_grid(g) for g in worlds])
+        self.cells = cells
+        self.n, self.h, self.w = cells.shape
+        flat = cells.reshape(-1)
+        self.blocked = flat == OBSTACLE
+        self.goal = flat == GOAL
+        self.offset = np.arange(self.n, dtype=np.int64) * (self.h * self.w)
+
+        deltas = np.array(action_space.deltas, dtype=np.int64)
+        self.dx, self.dy = deltas[:, 0], deltas[:, 1]
+
+        self.slip = None
+        self.slip_p = None
+        if slip is not None and np.any(np.asarray(slip) > 0):
+            if np.ndim(slip) == 0:
+                self.slip_p = float(slip)
+            else:
+                slip = np.asarray(slip, dtype=np.float64)
+                if slip.ndim == 3 and slip.shape[0] > 1:
+                    self.slip = np.broadcast_to(slip, cells.shape).reshape(-1).copy()
+                    self.slip_offset = self.offset
+                else:
+                    # an [H, W] map is shared by all envs, not copied B times
+                    self.slip = np.broadcast_to(slip.reshape(slip.shape[-2:]), cells.shape[1:]).reshape(-1).copy()
+                    self.slip_offset = 0
+        self.rng = np.random.default_rng(slip_seed)
+
+        starts = np.asarray(starts, dtype=np.int64)
+        self.start = np.broadcast_to(starts, (self.n, 2)).copy()
+        self.max_steps = max_steps
+        self.auto_reset = auto_reset
+        self.random_start = random_start
+        seeds = range(self.n) if seeds is None else seeds
+        self.reset_rng = np.random.default_rng([int(s) for s in seeds])
+        if random_start:
+            # ragged per-env free-cell lists: local indices, grouped by env
+            free = ~self.blocked.reshape(self.n, -1)
+            self.free_count = free.sum(axis=1)
+            if (self.free_count == 0).any():
+                raise ValueError("random_start needs a free cell in every world")
+            self.free_first = np.concatenate(([0], np.cumsum(self.free_count)[:-1]))
+            self.free_cells = np.nonzero(free)[1].astype(np.int32)
+
+        self.x = self.start[:, 0].copy()
+        self.y = self.start[:, 1].copy()
+        self.t = np.zeros(self.n, dtype=np.int64)
+
+    @property
+    def positions(self) -> np.ndarray:
+        """[B, 2] current (x, y) per env."""
+        return np.stack((self.x, self.y), axis=1)
+
+    def reset(self, mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Resets all envs, or those where mask is True. Returns positions.
+        """
+        idx = np.arange(self.n) if mask is None else np.flatnonzero(mask)
+        if self.random_start:
+            u = self.reset_rng.random(len(idx))
+            pick = self.free_first[idx] + (u * self.free_count[idx]).astype(np.int64)
+            c = self.free_cells[pick]
+            self.x[idx], self.y[idx] = c % self.w, c // self.w
+        else:
+            self.x[idx] = self.start[idx, 0]
+            self.y[idx] = self.start[idx, 1]
+        self.t[idx] = 0
+        return self.positions
+
+    def _move(self, actions: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Deterministic target positions after actions (blocked moves stay).
+        """
+        nx = self.x + self.dx[actions]
+        ny = self.y + self.dy[actions]
+        inside = (nx >= 0) & (nx < self.w) & (ny >= 0) & (ny < self.h)
+        flat = self.offset + np.where(inside, ny * self.w + nx, 0)
+        ok = inside & ~self.blocked[flat]
+        return np.where(ok, nx, self.x), np.where(ok, ny, self.y)
+
+    def _slipped(self) -> Optional[np.ndarray]:
+        """
+        Indices of the envs that slip this step (None when slip is off).
+
+        A scalar probability p is sampled by geometric gaps between slips,
+        so the cost scales with the number of slips rather than B; a slip
+        map only draws for envs standing on slippery cells.
+        """
+        if self.slip_p is not None:
+            if self.slip_p >= 1.0:
+                return np.arange(self.n)
+            gaps = self.rng.geometric(self.slip_p, size=int(self.n * self.slip_p * 1.2) + 16)
+            idx = np.cumsum(gaps) - 1
+            while idx[-1] < self.n:
+                more = self.rng.geometric(self.slip_p, size=len(gaps))
+                idx = np.concatenate((idx, idx[-1] + np.cumsum(more)))
+            return idx[idx < self.n]
+        if self.slip is None:
+            return None
+        p = self.slip[self.slip_offset + self.y * self.w + self.x]
+        live = np.flatnonzero(p > 0.0)
+        return live[self.rng.random(live.size) < p[live]]
+
+    def step(self, actions) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Steps every env with its action id.
+
+        Returns:
+            positions [B, 2], rewards [B], dones [B]
+        """
+        actions = np.asarray(actions, dtype=np.int64)
+        slipped = self._slipped()
+        if slipped is not None and slipped.size:
+            actions = actions.copy()
+            actions[slipped] = self.rng.integers(0, len(self.dx), slipped.size)
+        self.x, self.y = self._move(actions)
+        self.t += 1
+
+        reward = self.goal[self.offset + self.y * self.w + self.x].astype(np.float64)
+        done = reward > 0.0
+        if self.max_steps is not None:
+            done |= self.t >= self.max_steps
+
+        positions = self.positions
+        if self.auto_reset and done.any():
+            self.reset(done)
+        return positions, reward, done
+
+    def snapshot(self):
+        """
+        Token for the current state; the world array is not copied.
+        """
+        return (
+            self.x.copy(),
+            self.y.copy(),
+            self.t.copy(),
+            self.reset_rng.bit_generator.state if self.random_start else None,
+            self.rng.bit_generator.state,
+        )
+
+    def restore(self, token) -> None:
+        x, y, t, reset_state, slip_state = token
+        self.x, self.y, self.t = x.copy(), y.copy(), t.copy()
+        if reset_state is not None:
+            self.reset_rng.bit_generator.state = reset_state
+        self.rng.bit_generator.state = slip_state
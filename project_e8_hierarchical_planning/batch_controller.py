@@ -0,0 +1,85 @@
+"""
+Batch Option Controller (Many Agents per Tick)
+
+OptionController holds one active option and steps one WorldState, so N
+agents need N controllers and N Python-level policy calls per tick.
+
+BatchOptionController keeps the state of all agents in arrays:
+
+    active[N]     index of each agent's active option (-1 = none)
+    positions[N, 2]
+
+Each tick, agents are grouped by active option. Options that provide
+policy_batch / termination_batch are evaluated once per group; others fall
+back to per-agent closure calls. The result is an [N] array of integer
+action ids (see action_space), so the per-tick Python overhead depends on
+the number of distinct options rather than the number of agents.
+
+Semantics match OptionController.step for every agent.
+"""
+
+from dataclasses import replace
+from typing import List, Tuple
+
+import numpy as np
+
+from option import Option
+from state_adapter import WorldState
+from action_space import action_id, STAY
+
+
+class BatchOptionController:
+    """
+    Active-option bookkeeping and action selection for N agents.
+    """
+
+    def __init__(self, options: List[Option], n_agents: int, grid_size: Tuple[int, int]):
+        self.options = list(options)
+        self.grid_size = grid_size
+        self.active = np.full(n_agents, -1, dtype=np.int64)
+        self._ws = WorldState(grid_size=grid_size, agent_pos=(0, 0))
+
+    def _policy(self, opt: Option, pos: np.ndarray) -> np.ndarray:
+        if opt.policy_batch is not None:
+            return np.asarray(opt.policy_batch(pos), dtype=np.int64)
+        return np.array(
+            [action_id(opt.policy(replace(self._ws, agent_pos=(int(x), int(y))))) for x, y in pos],
+            dtype=np.int64,
+        )
+
+    def _termination(self, opt: Option, pos: np.ndarray) -> np.ndarray:
+        if opt.termination_batch is not None:
+            return np.asarray(opt.termination_batch(pos), dtype=bool)
+        return np.array(
+            [bool(opt.termination(replace(self._ws, agent_pos=(int(x), int(y))))) for x, y in pos],
+            dtype=bool,
+        )
+
+    def step(self, positions: np.ndarray, chosen: np.ndarray) -> np.ndarray:
+        """
+        One controller tick for all agents.
+
+        positions: [N, 2] current (x, y) per agent
+        chosen:    [N] option index to activate where none is active
+                   (-1 leaves the agent idle)
+
+        Returns:
+            [N] integer action ids (STAY for idle agents)
+        """
+        positions = np.asarray(positions)
+        idle = self.active < 0
+        self.active[idle] = np.asarray(chosen)[idle]
+
+        actions = np.full(len(self.active), STAY, dtype=np.int64)
+        done = np.zeros(len(self.active), dtype=bool)
+        for k in np.unique(self.active):
+            if k < 0:
+                continue
+            idx = np.flatnonzero(self.active == k)
+            pos = positions[idx]
+            opt = self.options[k]
+            actions[idx] = self._policy(opt, pos)
+            done[idx] = self._termination(opt, pos)
+
+        self.active[done] = -1
+        return actions
@@ -9,9 +9,15 @@ Executes a selected option by:
 This cleanly separates:
 - deciding what to do (planner)
 - deciding how to do it (option)
+
+Deterministic options can instead be run as a whole macro-action from a
+MacroCache, replaying recorded actions without per-step policy calls.
 """
 
+from typing import Hashable
+
 from option import Option
+from macro_cache import MacroCache, MacroTrajectory, env_step_fn
 
 
 class OptionController:
@@ -41,3 +47,27 @@ class OptionController:
             self.active_option = None
 
         return action
+
+    def run_macro(self, env, ws, option: Option, cache: MacroCache, world: Hashable = None) -> MacroTrajectory:
+        """
+        Executes the whole option in env in one call.
+
+        The recorded macro is replayed action by action. If reality
+        diverges from the recorded positions, the stale macro is dropped
+        and execution stops at the divergence.
+
+        world keys the cache entry when one cache serves several envs.
+
+        Returns the executed trajectory; ws.agent_pos is updated in place.
+        """
+        start = ws.agent_pos
+        m = cache.lookup(option, ws, env_step_fn(env), world)
+        self.active_option = None
+        for i, (a, expected) in enumerate(zip(m.actions, m.positions)):
+            ws.agent_pos = env.step(a)
+            if ws.agent_pos != expected:
+                cache.invalidate_cells([expected])
+                return MacroTrajectory(
+                    m.option, start, m.actions[:i + 1], m.positions[:i] + [ws.agent_pos], ws.agent_pos
+                )
+        return m
@@ -15,6 +15,7 @@ from env_gridworld import GridworldEnv
 from state_adapter import WorldState
 from option_library import navigate_right_option, navigate_up_option
 from option_planner import choose_option
+from option_index import OptionIndex
 from controller import OptionController
 
 
@@ -29,6 +30,7 @@ def main():
         navigate_right_option(grid_width=5),
     ]
 
+    index = OptionIndex(options, grid_size=(5, 5))
     controller = OptionController()
 
     print("=== Project E8 Demo: Hierarchical Planning ===")
@@ -37,7 +39,7 @@ def main():
 
     for t in range(15):
         # 1) High-level decision: choose an option
-        option = choose_option(ws, options)
+        option = choose_option(ws, options, index)
         if option is None:
             print("No applicable options.")
             break
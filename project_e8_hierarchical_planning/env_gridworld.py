@@ -9,26 +9,37 @@ Important:
 - Used only for execution and evaluation
 """
 
+from action_space import DEFAULT_ACTION_SPACE
+
+
 class GridworldEnv:
-    def __init__(self, width, height, agent_pos=(0, 0)):
+    def __init__(self, width, height, agent_pos=(0, 0), action_space=DEFAULT_ACTION_SPACE):
         self.width = width
         self.height = height
         self.agent_pos = agent_pos
+        self.action_space = action_space
 
     def step(self, action):
         """
-        Executes a primitive action and updates agent position.
+        Executes a primitive action (name or integer id) and updates agent
+        position. Moves are clamped to the grid.
         """
         x, y = self.agent_pos
-
-        if action == "right":
-            x = min(self.width - 1, x + 1)
-        elif action == "left":
-            x = max(0, x - 1)
-        elif action == "up":
-            y = max(0, y - 1)
-        elif action == "down":
-            y = min(self.height - 1, y + 1)
+        dx, dy = self.action_space.delta(action)
+        x = min(self.width - 1, max(0, x + dx))
+        y = min(self.height - 1, max(0, y + dy))
 
         self.agent_pos = (x, y)
         return self.agent_pos
+
+    def snapshot(self):
+        """
+        O(1) token for the current state (only the agent position changes).
+        """
+        return self.agent_pos
+
+    def restore(self, token):
+        """
+        Returns to a snapshot. There is no grid, so nothing else to undo.
+        """
+        self.agent_pos = token
@@ -0,0 +1,311 @@
+"""
+Hierarchical Abstract Graph Planner (HPA*-Style)
+
+Cell-level planners scale with map area. This planner plans over an
+abstract graph instead:
+
+1) The belief map is partitioned into square clusters.
+2) On each border between adjacent clusters, every contiguous run of
+   cells that is free on both sides gets an entrance: a pair of nodes
+   facing each other across the border (inter edge, cost 1). Runs of at
+   least `wide_entrance` cells get one entrance at each end instead of
+   one in the middle, which keeps detours short.
+3) Within a cluster, entrance nodes are connected by their shortest
+   in-cluster distance (intra edges). These are computed lazily, the first
+   time a search expands the cluster, and cached.
+4) A query connects start and goal to the nodes of their own clusters and
+   runs A* over the abstract graph.
+
+Revealing cells only rebuilds the borders of the clusters containing them
+and drops the cached intra edges of those clusters and their neighbours.
+
+Every abstract edge can be executed as an E8 Option (edge_option), so the
+result of plan_options() plugs straight into OptionController.
+"""
+
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import heapq
+
+import numpy as np
+
+from option import Option
+from action_space import ACTIONS, DEFAULT_ACTION_SPACE
+
+Pos = Tuple[int, int]
+Cluster = Tuple[int, int]
+
+_MOVES = [(name, DEFAULT_ACTION_SPACE.delta(name)) for name in ACTIONS if DEFAULT_ACTION_SPACE.delta(name) != (0, 0)]
+
+
+class HierarchicalPlanner:
+    """
+    HPA*-style planner over a boolean obstacle map blocked[y, x].
+
+    The map array is kept by reference; after changing it, call
+    update(cells) with the changed cells.
+
+    Paths are near-optimal, not optimal: they are restricted to entrance
+    cells when crossing cluster borders.
+    """
+
+    def __init__(self, blocked: np.ndarray, cluster_size: int = 16, wide_entrance: int = 6):
+        self.blocked = np.asarray(blocked, dtype=bool)
+        self.wide_entrance = wide_entrance
+        self.h, self.w = self.blocked.shape
+        self.c = cluster_size
+        self.ncx = (self.w + self.c - 1) // self.c
+        self.ncy = (self.h + self.c - 1) // self.c
+
+        # border key (cluster_a, cluster_b) -> [(pos_a, pos_b)]
+        self.borders: Dict[Tuple[Cluster, Cluster], List[Tuple[Pos, Pos]]] = {}
+        self.inter: Dict[Pos, Set[Pos]] = {}
+        self.intra: Dict[Cluster, Dict[Pos, Dict[Pos, int]]] = {}
+        self.intra_builds = 0
+
+        for cy in range(self.ncy):
+            for cx in range(self.ncx):
+                if cx + 1 < self.ncx:
+                    self._build_border((cx, cy), (cx + 1, cy))
+                if cy + 1 < self.ncy:
+                    self._build_border((cx, cy), (cx, cy + 1))
+
+    @classmethod
+    def from_known_map(cls, known_map: List[List[str]], cluster_size: int = 16) -> "HierarchicalPlanner":
+        blocked = np.array([[cell == "obstacle" for cell in row] for row in known_map], dtype=bool)
+        return cls(blocked, cluster_size)
+
+    # ------------------------------------------------------------------
+    # Abstract graph construction
+    # ------------------------------------------------------------------
+
+    def cluster_of(self, pos: Pos) -> Cluster:
+        return (pos[0] // self.c, pos[1] // self.c)
+
+    def _bounds(self, cl: Cluster) -> Tuple[int, int, int, int]:
+        x0, y0 = cl[0] * self.c, cl[1] * self.c
+        return x0, y0, min(x0 + self.c, self.w), min(y0 + self.c, self.h)
+
+    def _build_border(self, a: Cluster, b: Cluster) -> None:
+        """
+        (Re)computes the entrances between clusters a and b (b right of or
+        below a), vectorized over the border.
+        """
+        for pa, pb in self.borders.pop((a, b), []):
+            self.inter.get(pa, set()).discard(pb)
+            self.inter.get(pb, set()).discard(pa)
+
+        ax0, ay0, ax1, ay1 = self._bounds(a)
+        if b[0] > a[0]:
+            x = ax1 - 1
+            free = ~self.blocked[ay0:ay1, x] & ~self.blocked[ay0:ay1, x + 1]
+            to_pair = lambda i: ((x, ay0 + i), (x + 1, ay0 + i))
+        else:
+            y = ay1 - 1
+            free = ~self.blocked[y, ax0:ax1] & ~self.blocked[y + 1, ax0:ax1]
+            to_pair = lambda i: ((ax0 + i, y), (ax0 + i, y + 1))
+
+        edges = np.diff(np.concatenate(([0], free.astype(np.int8), [0])))
+        starts, ends = np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+        pairs = []
+        for s, e in zip(starts.tolist(), ends.tolist()):
+            if e - s >= self.wide_entrance:
+                pairs += [to_pair(s), to_pair(e - 1)]
+            else:
+                pairs.append(to_pair((s + e - 1) // 2))
+        self.borders[(a, b)] = pairs
+        for pa, pb in pairs:
+            self.inter.setdefault(pa, set()).add(pb)
+            self.inter.setdefault(pb, set()).add(pa)
+
+    def _neighbours(self, cl: Cluster) -> List[Cluster]:
+        cx, cy = cl
+        out = []
+        for nx, ny in ((cx - 1, cy), (cx + 1, cy), (cx, cy - 1), (cx, cy + 1)):
+            if 0 <= nx < self.ncx and 0 <= ny < self.ncy:
+                out.append((nx, ny))
+        return out
+
+    def _nodes(self, cl: Cluster) -> List[Pos]:
+        nodes = set()
+        for nb in self._neighbours(cl):
+            key = (cl, nb) if nb >= cl else (nb, cl)
+            for pa, pb in self.borders.get(key, ()):
+                nodes.add(pa if self.cluster_of(pa) == cl else pb)
+        return sorted(nodes)
+
+    def _bfs(self, cl: Cluster, src: Pos) -> Tuple[List[int], List[int], int, int, int]:
+        """
+        In-cluster BFS from src over flat local indices.
+
+        Returns (dist, parent, x0, y0, width); unreachable cells have
+        dist -1.
+        """
+        x0, y0, x1, y1 = self._bounds(cl)
+        cw = x1 - x0
+        free = (~self.blocked[y0:y1, x0:x1]).ravel().tolist()
+        n = len(free)
+        dist = [-1] * n
+        parent = [-1] * n
+        s = (src[1] - y0) * cw + (src[0] - x0)
+        dist[s] = 0
+        q = deque([s])
+        while q:
+            i = q.popleft()
+            d = dist[i] + 1
+            x = i % cw
+            for j in (i - cw, i + cw, i - 1 if x > 0 else -1, i + 1 if x + 1 < cw else -1):
+                if 0 <= j < n and dist[j] < 0 and free[j]:
+                    dist[j] = d
+                    parent[j] = i
+                    q.append(j)
+        return dist, parent, x0, y0, cw
+
+    @staticmethod
+    def _local(p: Pos, x0: int, y0: int, cw: int) -> int:
+        return (p[1] - y0) * cw + (p[0] - x0)
+
+    def _intra(self, cl: Cluster) -> Dict[Pos, Dict[Pos, int]]:
+        """
+        Cached shortest in-cluster distances between entrance nodes.
+        """
+        table = self.intra.get(cl)
+        if table is None:
+            self.intra_builds += 1
+            nodes = self._nodes(cl)
+            table = {n: {} for n in nodes}
+            for i, n in enumerate(nodes):
+                dist, _, x0, y0, cw = self._bfs(cl, n)
+                for m in nodes[i + 1:]:
+                    d = dist[self._local(m, x0, y0, cw)]
+                    if d >= 0:
+                        table[n][m] = d
+                        table[m][n] = d
+            self.intra[cl] = table
+        return table
+
+    def update(self, cells: Iterable[Pos]) -> None:
+        """
+        Refreshes the graph after the cells' blocked status changed.
+
+        Only borders of the touched clusters are rebuilt; cached intra
+        edges are dropped for those clusters and their neighbours.
+        """
+        dirty = {self.cluster_of(p) for p in cells}
+        affected = set(dirty)
+        for cl in dirty:
+            for nb in self._neighbours(cl):
+                self._build_border(*((cl, nb) if nb >= cl else (nb, cl)))
+                affected.add(nb)
+        for cl in affected:
+            self.intra.pop(cl, None)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def _attach(self, p: Pos, extra: Optional[Pos] = None) -> Dict[Pos, int]:
+        """
+        Distances from p to the entrance nodes of its cluster (and to
+        `extra` if it lies in the same cluster and is reachable).
+        """
+        cl = self.cluster_of(p)
+        dist, _, x0, y0, cw = self._bfs(cl, p)
+        targets = self._nodes(cl)
+        if extra is not None and self.cluster_of(extra) == cl:
+            targets.append(extra)
+        out = {}
+        for n in targets:
+            d = dist[self._local(n, x0, y0, cw)]
+            if d >= 0:
+                out[n] = d
+        return out
+
+    def plan(self, start: Pos, goal: Pos) -> Optional[List[Pos]]:
+        """
+        Abstract path [start, node, ..., goal], or None if unreachable.
+        """
+        if self.blocked[start[1], start[0]] or self.blocked[goal[1], goal[0]]:
+            return None
+        if start == goal:
+            return [start]
+
+        start_edges = self._attach(start, extra=goal)
+        goal_edges = self._attach(goal)
+
+        gx, gy = goal
+        hfn = lambda p: abs(p[0] - gx) + abs(p[1] - gy)
+        g = {start: 0}
+        came: Dict[Pos, Pos] = {}
+        # ties on f prefer deeper nodes (larger g)
+        heap = [(hfn(start), 0, start)]
+        while heap:
+            _, negd, n = heapq.heappop(heap)
+            d = -negd
+            if n == goal:
+                path = [n]
+                while n in came:
+                    n = came[n]
+                    path.append(n)
+                return path[::-1]
+            if d > g[n]:
+                continue
+
+            # start may itself be an entrance node: keep its graph edges too
+            succ = list(self._intra(self.cluster_of(n)).get(n, {}).items())
+            succ += [(m, 1) for m in self.inter.get(n, ())]
+            if n == start:
+                succ += list(start_edges.items())
+            if n in goal_edges:
+                succ.append((goal, goal_edges[n]))
+
+            for m, w in succ:
+                nd = d + w
+                if nd < g.get(m, float("inf")):
+                    g[m] = nd
+                    came[m] = n
+                    heapq.heappush(heap, (nd + hfn(m), -nd, m))
+        return None
+
+    def refine(self, a: Pos, b: Pos) -> List[Pos]:
+        """
+        Cell path from a to b for one abstract edge (a, b inclusive).
+        """
+        if b in self.inter.get(a, ()):
+            return [a, b]
+        _, parent, x0, y0, cw = self._bfs(self.cluster_of(a), a)
+        i, s = self._local(b, x0, y0, cw), self._local(a, x0, y0, cw)
+        path = [b]
+        while i != s:
+            i = parent[i]
+            path.append((x0 + i % cw, y0 + i // cw))
+        return path[::-1]
+
+    def edge_option(self, a: Pos, b: Pos) -> Option:
+        """
+        Option that walks the refined path of abstract edge a -> b.
+        """
+        path = self.refine(a, b)
+        step_action = {}
+        for p, q in zip(path, path[1:]):
+            for name, d in _MOVES:
+                if (p[0] + d[0], p[1] + d[1]) == q:
+                    step_action[p] = name
+
+        return Option(
+            name=f"hpa:{a}->{b}",
+            initiation=lambda ws: ws.agent_pos == a,
+            policy=lambda ws: step_action.get(ws.agent_pos, "stay"),
+            termination=lambda ws: ws.agent_pos == b or ws.agent_pos not in step_action,
+            positional=True,
+            deterministic=True,
+        )
+
+    def plan_options(self, start: Pos, goal: Pos) -> Optional[List[Option]]:
+        """
+        The abstract plan as a sequence of executable Options.
+        """
+        path = self.plan(start, goal)
+        if path is None:
+            return None
+        return [self.edge_option(a, b) for a, b in zip(path, path[1:])]
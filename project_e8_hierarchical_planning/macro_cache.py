@@ -0,0 +1,132 @@
+"""
+Macro-Trajectory Cache (Deterministic Option Replay)
+
+Deterministic options (e.g. navigate_right / navigate_up) always produce
+the same primitive actions from the same start on the same map, yet
+OptionController re-queries policy and termination on every step.
+
+MacroCache records, per (world, option, start position):
+- the full primitive action sequence
+- the positions visited
+- the end position
+
+Each entry is indexed by the cells it depends on (visited cells and the
+targets of every attempted move). When perception changes any of those
+cells, invalidate_cells() drops exactly the affected entries. Move targets
+come from the cache's action_space, which must be the one the step
+function (the env) uses.
+
+Entries depend on the map they were recorded on. A cache shared between
+several worlds must be given a distinct `world` key for each; with the
+default world=None a cache serves a single world.
+
+With a cached macro:
+- planners skip over the option in one step (jump to macro.end, cost
+  len(macro.actions))
+- the controller replays the recorded actions without calling policy or
+  termination (OptionController.run_macro)
+"""
+
+from copy import copy
+from dataclasses import dataclass, field, replace
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+from option import Option
+from action_space import ActionSpace, DEFAULT_ACTION_SPACE
+
+Pos = Tuple[int, int]
+Key = Tuple[Hashable, str, Pos]
+StepFn = Callable[[Pos, str], Pos]
+
+
+@dataclass
+class MacroTrajectory:
+    option: str
+    start: Pos
+    actions: List[str]
+    positions: List[Pos]  # position after each action
+    end: Pos
+
+
+def env_step_fn(env) -> StepFn:
+    """
+    Side-effect-free step function backed by a scratch copy of env.
+    """
+    scratch = copy(env)
+
+    def step(pos: Pos, action: str) -> Pos:
+        scratch.agent_pos = pos
+        return scratch.step(action)
+
+    return step
+
+
+@dataclass
+class MacroCache:
+    """
+    (world, option, start) -> MacroTrajectory, for deterministic options only.
+    """
+    max_steps: int = 100
+    action_space: ActionSpace = DEFAULT_ACTION_SPACE
+    entries: Dict[Key, MacroTrajectory] = field(default_factory=dict)
+    by_cell: Dict[Pos, Set[Key]] = field(default_factory=dict)
+    hits: int = 0
+    misses: int = 0
+
+    def get(self, option: Option, start: Pos, world: Hashable = None) -> Optional[MacroTrajectory]:
+        m = self.entries.get((world, option.name, start))
+        if m is not None:
+            self.hits += 1
+        return m
+
+    def record(self, option: Option, ws, step: StepFn, world: Hashable = None) -> MacroTrajectory:
+        """
+        Simulates the option from ws to termination and caches the result.
+
+        Stepping mirrors OptionController: the option stops, without
+        acting, once termination holds.
+        """
+        self.misses += 1
+        start = ws.agent_pos
+        actions: List[str] = []
+        positions: List[Pos] = []
+        cells: Set[Pos] = {start}
+        s = replace(ws)
+
+        for _ in range(self.max_steps):
+            if option.termination(s):
+                break
+            a = option.policy(s)
+            dx, dy = self.action_space.delta(a)
+            x, y = s.agent_pos
+            cells.add((x + dx, y + dy))
+            s.agent_pos = step(s.agent_pos, a)
+            cells.add(s.agent_pos)
+            actions.append(a)
+            positions.append(s.agent_pos)
+
+        m = MacroTrajectory(option.name, start, actions, positions, s.agent_pos)
+        if option.deterministic:
+            key = (world, option.name, start)
+            self.entries[key] = m
+            for c in cells:
+                self.by_cell.setdefault(c, set()).add(key)
+        return m
+
+    def lookup(self, option: Option, ws, step: StepFn, world: Hashable = None) -> MacroTrajectory:
+        """
+        Cached macro if available, otherwise records one.
+        """
+        m = self.get(option, ws.agent_pos, world) if option.deterministic else None
+        return m if m is not None else self.record(option, ws, step, world)
+
+    def invalidate_cells(self, cells: Iterable[Pos]) -> int:
+        """
+        Drops every macro depending on any of `cells`. Returns the count.
+        """
+        dropped = 0
+        for c in cells:
+            for key in self.by_cell.pop(c, ()):
+                if self.entries.pop(key, None) is not None:
+                    dropped += 1
+        return dropped
@@ -13,7 +13,7 @@ This is the core building block of hierarchical planning.
 """
 
 from dataclasses import dataclass
-from typing import Callable, Any
+from typing import Callable, Any, Optional, Sequence, Tuple
 
 
 @dataclass
@@ -30,8 +30,30 @@ class Option:
 
     - termination(state) -> bool
         Determines when the option should stop execution.
+
+    Optional indexing hints (see option_index):
+    - initiation_mask(grid_size) -> mask[y][x]
+        The initiation set as a precomputable grid mask.
+
+    - positional
+        True if initiation depends only on agent_pos, so its results can be
+        learned and reused per cell.
+
+    - deterministic
+        True if policy and termination are fixed given the start state and
+        the map, so whole executions can be cached (see macro_cache).
+
+    Optional vectorized forms (see batch_controller), over an [N, 2] array
+    of agent positions:
+    - policy_batch(positions) -> [N] integer action ids
+    - termination_batch(positions) -> [N] bool
     """
     name: str
     initiation: Callable[[Any], bool]
     policy: Callable[[Any], str]
     termination: Callable[[Any], bool]
+    initiation_mask: Optional[Callable[[Tuple[int, int]], Sequence[Sequence[bool]]]] = None
+    positional: bool = False
+    deterministic: bool = False
+    policy_batch: Optional[Callable[[Any], Any]] = None
+    termination_batch: Optional[Callable[[Any], Any]] = None
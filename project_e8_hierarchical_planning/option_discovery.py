@@ -0,0 +1,157 @@
+"""
+Option Discovery (Skills Promoted From Logged Trajectories)
+
+option_library options are hand-written. This module mines them from
+recorded episodes instead (offline):
+
+1) Count every action subsequence of length min_len..max_len across all
+   episodes (one pass per length), together with the reward collected
+   along each occurrence.
+2) Score each frequent subsequence:
+
+       score = support * (length - 1) * (1 + mean_return)
+
+   support * (length - 1) is the number of decisions the skill would have
+   saved the high-level planner; returns favour useful behaviour.
+3) Greedily keep the best-scoring subsequences, skipping ones contained in
+   an already selected skill.
+4) Turn each into an Option:
+   - initiation: compiled grid mask of the logged start positions
+   - policy: cached table position -> action along the logged paths
+   - termination: the agent left the table (end of a logged path)
+
+Occurrences that revisit a cell or overlap an earlier occurrence are not
+used for the policy table, so every discovered option is deterministic.
+
+Episodes are lists of (pos, action, next_pos, reward) steps.
+episodes_from_experience converts E5-style experience records.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+from option import Option
+
+Pos = Tuple[int, int]
+Step = Tuple[Pos, str, Pos, float]
+
+
+@dataclass
+class DiscoveredSkill:
+    actions: Tuple[str, ...]
+    support: int
+    mean_return: float
+    score: float
+    occurrences: List[List[Step]] = field(default_factory=list)
+
+
+def episodes_from_experience(records: Iterable, reward_key: str = "real_reward") -> List[List[Step]]:
+    """
+    Groups experience records (state_pos, action, actual_next_pos, t,
+    meta[reward_key]) into episodes, splitting where t is not consecutive or
+    the position jumps.
+
+    E5 stores the environment reward under meta["real_reward"].
+    """
+    episodes: List[List[Step]] = []
+    prev = None
+    for r in records:
+        reward = float(getattr(r, "meta", {}).get(reward_key, 0.0))
+        step = (r.state_pos, r.action, r.actual_next_pos, reward)
+        if prev is None or r.t != prev.t + 1 or r.state_pos != prev.actual_next_pos:
+            episodes.append([])
+        episodes[-1].append(step)
+        prev = r
+    return episodes
+
+
+def mine_skills(
+    episodes: Sequence[Sequence[Step]],
+    min_len: int = 3,
+    max_len: int = 8,
+    min_support: int = 3,
+    top_k: int = 5,
+) -> List[DiscoveredSkill]:
+    """
+    Frequent, high-value action subsequences, best first.
+    """
+    found: Dict[Tuple[str, ...], DiscoveredSkill] = {}
+    where: Dict[Tuple[str, ...], List[Tuple[int, int]]] = {}
+    for n in range(min_len, max_len + 1):
+        for e, ep in enumerate(episodes):
+            actions = [s[1] for s in ep]
+            rewards = [s[3] for s in ep]
+            for i in range(len(ep) - n + 1):
+                key = tuple(actions[i:i + n])
+                sk = found.get(key)
+                if sk is None:
+                    sk = found[key] = DiscoveredSkill(key, 0, 0.0, 0.0)
+                    where[key] = []
+                sk.support += 1
+                sk.mean_return += sum(rewards[i:i + n])
+                where[key].append((e, i))
+
+    ranked = []
+    for sk in found.values():
+        if sk.support < min_support:
+            continue
+        sk.mean_return /= sk.support
+        sk.score = sk.support * (len(sk.actions) - 1) * (1.0 + sk.mean_return)
+        ranked.append(sk)
+    ranked.sort(key=lambda s: (-s.score, -len(s.actions), s.actions))
+
+    def contains(big: Tuple[str, ...], small: Tuple[str, ...]) -> bool:
+        return any(big[i:i + len(small)] == small for i in range(len(big) - len(small) + 1))
+
+    chosen: List[DiscoveredSkill] = []
+    for sk in ranked:
+        if len(chosen) >= top_k:
+            break
+        if not any(contains(c.actions, sk.actions) for c in chosen):
+            n = len(sk.actions)
+            sk.occurrences = [list(episodes[e][i:i + n]) for e, i in where[sk.actions]]
+            chosen.append(sk)
+    return chosen
+
+
+def skill_to_option(skill: DiscoveredSkill, grid_size: Tuple[int, int], name: str = "") -> Option:
+    """
+    Compiles a mined skill into a deterministic, positional Option.
+    """
+    table: Dict[Pos, str] = {}
+    ends = set()
+    starts = set()
+    for occ in skill.occurrences:
+        cells = [s[0] for s in occ] + [occ[-1][2]]
+        if len(set(cells)) != len(cells):
+            continue
+        if any(c in table or c in ends for c in cells):
+            continue
+        for s in occ:
+            table[s[0]] = s[1]
+        ends.add(cells[-1])
+        starts.add(cells[0])
+
+    w, h = grid_size
+    mask = [[(x, y) in starts for x in range(w)] for y in range(h)]
+
+    return Option(
+        name=name or "skill:" + "-".join(skill.actions),
+        initiation=lambda ws: ws.agent_pos in starts,
+        policy=lambda ws: table.get(ws.agent_pos, "stay"),
+        termination=lambda ws: ws.agent_pos not in table,
+        initiation_mask=lambda gs: mask,
+        positional=True,
+        deterministic=True,
+    )
+
+
+def discover_options(
+    episodes: Sequence[Sequence[Step]],
+    grid_size: Tuple[int, int],
+    **mine_kwargs,
+) -> List[Option]:
+    """
+    Full pipeline: mine skills from episodes and compile them to Options.
+    """
+    return [skill_to_option(sk, grid_size) for sk in mine_skills(episodes, **mine_kwargs)]
@@ -0,0 +1,123 @@
+"""
+Option Index (Per-Cell Initiation Bitsets)
+
+choose_option scans every option and calls its initiation closure on each
+decision. With large skill libraries that scan dominates the high-level
+loop.
+
+OptionIndex stores, per grid cell, an integer bitset:
+
+    bits[cell]  bit i set  -> option i is applicable at that cell
+    known[cell] bit i set  -> bit i of bits[cell] is authoritative
+
+Sources of knowledge, per option:
+- initiation_mask(grid_size): the whole grid is compiled up front
+- positional options: closure results (and execution history) are
+  memoized per cell the first time they are seen
+- anything else is dynamic: its closure is evaluated on every lookup
+
+"Which options apply here" is then one bitset read plus closure calls only
+for unknown / dynamic bits. Bit order follows the option list, so the
+first applicable option is the lowest set bit, as in choose_option.
+"""
+
+from typing import List, Optional, Tuple
+
+from option import Option
+
+Pos = Tuple[int, int]
+
+
+class OptionIndex:
+    """
+    Applicable-option lookup backed by per-cell bitsets.
+    """
+
+    def __init__(self, options: List[Option], grid_size: Tuple[int, int]):
+        self.options = list(options)
+        self.grid_size = grid_size
+        self.ids = {opt.name: i for i, opt in enumerate(self.options)}
+        w, h = grid_size
+        self.bits = [0] * (w * h)
+        self.known = [0] * (w * h)
+        self.cacheable = 0
+        self.closure_calls = 0
+
+        for i, opt in enumerate(self.options):
+            bit = 1 << i
+            if opt.initiation_mask is not None:
+                self._compile(bit, opt.initiation_mask(grid_size))
+            elif opt.positional:
+                self.cacheable |= bit
+
+    def _compile(self, bit: int, mask) -> None:
+        w, h = self.grid_size
+        for y in range(h):
+            row = mask[y]
+            for x in range(w):
+                c = y * w + x
+                self.known[c] |= bit
+                if row[x]:
+                    self.bits[c] |= bit
+
+    def observe(self, name: str, pos: Pos, applicable: bool = True) -> None:
+        """
+        Records initiation knowledge for a positional option, e.g. from a
+        logged execution that started at pos.
+        """
+        bit = 1 << self.ids[name]
+        if not bit & self.cacheable:
+            return
+        x, y = pos
+        c = y * self.grid_size[0] + x
+        self.known[c] |= bit
+        if applicable:
+            self.bits[c] |= bit
+        else:
+            self.bits[c] &= ~bit
+
+    def learn_from_model(self, model) -> None:
+        """
+        Marks every (option, start) an OptionModel has seen as applicable.
+        """
+        for name, start in model.stats:
+            if name in self.ids:
+                self.observe(name, start, True)
+
+    def applicable_bits(self, ws) -> int:
+        """
+        Bitset of options applicable in ws.
+        """
+        x, y = ws.agent_pos
+        c = y * self.grid_size[0] + x
+        bits = self.bits[c]
+        unknown = ~self.known[c] & ((1 << len(self.options)) - 1)
+        while unknown:
+            low = unknown & -unknown
+            unknown ^= low
+            i = low.bit_length() - 1
+            self.closure_calls += 1
+            ok = bool(self.options[i].initiation(ws))
+            if ok:
+                bits |= low
+            if low & self.cacheable:
+                self.known[c] |= low
+                if ok:
+                    self.bits[c] |= low
+        return bits
+
+    def applicable(self, ws) -> List[Option]:
+        """
+        Applicable options, in list order.
+        """
+        bits = self.applicable_bits(ws)
+        return [opt for i, opt in enumerate(self.options) if bits >> i & 1]
+
+    def first_applicable(self, ws) -> Optional[Option]:
+        """
+        Same result as choose_option(ws, options).
+        """
+        bits = self.applicable_bits(ws)
+        if not bits:
+            return None
+        return self.options[(bits & -bits).bit_length() - 1]
@@ -7,7 +7,10 @@ In E8 v1, options are hand-designed.
 In later versions, these can be learned or promoted from trajectories.
 """
 
+import numpy as np
+
 from option import Option
+from action_space import UP, RIGHT
 
 
 def navigate_right_option(grid_width: int):
@@ -35,11 +38,26 @@ def navigate_right_option(grid_width: int):
     def termination(ws):
         return ws.agent_pos[0] >= grid_width - 1
 
+    def initiation_mask(grid_size):
+        w, h = grid_size
+        return [[x < grid_width - 1 for x in range(w)] for _ in range(h)]
+
+    def policy_batch(positions):
+        return np.full(len(positions), RIGHT, dtype=np.int64)
+
+    def termination_batch(positions):
+        return positions[:, 0] >= grid_width - 1
+
     return Option(
         name="navigate_right",
         initiation=initiation,
         policy=policy,
         termination=termination,
+        initiation_mask=initiation_mask,
+        positional=True,
+        deterministic=True,
+        policy_batch=policy_batch,
+        termination_batch=termination_batch,
     )
 
 
@@ -68,9 +86,24 @@ def navigate_up_option():
     def termination(ws):
         return ws.agent_pos[1] == 0
 
+    def initiation_mask(grid_size):
+        w, h = grid_size
+        return [[y > 0] * w for y in range(h)]
+
+    def policy_batch(positions):
+        return np.full(len(positions), UP, dtype=np.int64)
+
+    def termination_batch(positions):
+        return positions[:, 1] == 0
+
     return Option(
         name="navigate_up",
         initiation=initiation,
         policy=policy,
         termination=termination,
+        initiation_mask=initiation_mask,
+        positional=True,
+        deterministic=True,
+        policy_batch=policy_batch,
+        termination_batch=termination_batch,
     )
@@ -0,0 +1,180 @@
+"""
+Option Model (SMDP Outcome Statistics)
+
+Models what happens when an option runs to termination:
+
+    (start state, option) -> distribution over
+        termination state, duration (steps), accumulated cost
+
+Statistics are learned from real executions through OptionController
+(see execute_option). Each (option, start position) keeps, per observed
+termination position:
+- visit count
+- summed duration
+- summed cost
+
+Deterministic options can be executed from a MacroCache (one call per
+option instead of one policy/termination query per step).
+
+Option-level rollouts sample a termination state and jump straight to it,
+so a rollout of D options costs D samples instead of D * (option length)
+primitive steps. This is what makes long-horizon search over skills cheap.
+"""
+
+from dataclasses import dataclass, field, replace
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+import random
+
+from option import Option
+from controller import OptionController
+from macro_cache import MacroCache
+
+Pos = Tuple[int, int]
+Key = Tuple[str, Pos]
+
+
+@dataclass
+class OptionOutcome:
+    """
+    One (sampled or observed) option execution.
+    """
+    option: str
+    start: Pos
+    end: Pos
+    duration: int
+    cost: float
+
+
+@dataclass
+class OptionModel:
+    """
+    Tabular SMDP model over options.
+
+    stats[(option_name, start)][end] = [count, duration_sum, cost_sum]
+    """
+    stats: Dict[Key, Dict[Pos, List[float]]] = field(default_factory=dict)
+    total: Dict[Key, float] = field(default_factory=dict)
+
+    def update(self, option: str, start: Pos, end: Pos, duration: int, cost: Optional[float] = None) -> None:
+        """
+        Records one execution. cost defaults to the duration (unit step cost).
+        """
+        key = (option, start)
+        row = self.stats.setdefault(key, {}).setdefault(end, [0.0, 0.0, 0.0])
+        row[0] += 1.0
+        row[1] += float(duration)
+        row[2] += float(duration if cost is None else cost)
+        self.total[key] = self.total.get(key, 0.0) + 1.0
+
+    def count(self, option: str, start: Pos) -> float:
+        return self.total.get((option, start), 0.0)
+
+    def expected(self, option: str, start: Pos) -> Optional[Dict[str, object]]:
+        """
+        Termination distribution and expected duration / cost, or None if
+        the option was never executed from start.
+        """
+        key = (option, start)
+        n = self.total.get(key, 0.0)
+        if n <= 0.0:
+            return None
+        rows = self.stats[key]
+        return {
+            "termination": {end: r[0] / n for end, r in rows.items()},
+            "duration": sum(r[1] for r in rows.values()) / n,
+            "cost": sum(r[2] for r in rows.values()) / n,
+            "count": n,
+        }
+
+    def sample(self, option: str, start: Pos, rng: Optional[random.Random] = None) -> Optional[OptionOutcome]:
+        """
+        Samples a termination state; duration and cost are the means
+        observed for that termination state.
+        """
+        rows = self.stats.get((option, start))
+        if not rows:
+            return None
+        rng = rng or random
+        ends = list(rows)
+        end = ends[0] if len(ends) == 1 else rng.choices(ends, weights=[rows[e][0] for e in ends])[0]
+        c, d, k = rows[end]
+        return OptionOutcome(option, start, end, int(round(d / c)), k / c)
+
+    def rollout(
+        self,
+        ws,
+        options: List[Option],
+        choose: Callable[[object, List[Option]], Optional[Option]],
+        depth: int,
+        rng: Optional[random.Random] = None,
+        first: Optional[Option] = None,
+    ) -> List[OptionOutcome]:
+        """
+        Option-level rollout: at each level, choose(ws, options) picks an
+        option (or `first` on the first level) and the model jumps to a
+        sampled termination state.
+
+        Stops early when no option is chosen or the model has no data for
+        the chosen option from the current state.
+        """
+        out: List[OptionOutcome] = []
+        for d in range(depth):
+            opt = first if (d == 0 and first is not None) else choose(ws, options)
+            if opt is None:
+                break
+            o = self.sample(opt.name, ws.agent_pos, rng)
+            if o is None:
+                break
+            out.append(o)
+            ws = replace(ws, agent_pos=o.end)
+        return out
+
+
+def execute_option(
+    env,
+    ws,
+    option: Option,
+    model: Optional[OptionModel] = None,
+    controller: Optional[OptionController] = None,
+    step_cost: Callable[[object, str], float] = lambda ws, a: 1.0,
+    max_steps: int = 100,
+    cache: Optional[MacroCache] = None,
+    world: Hashable = None,
+) -> OptionOutcome:
+    """
+    Runs an option in the environment until it terminates, via
+    OptionController, and records the outcome in the model.
+
+    With a MacroCache, deterministic options are run as one macro-action
+    (cached under `world`). If reality diverges from the cached macro, the
+    option continues step by step from the divergence.
+
+    ws.agent_pos is updated in place.
+    """
+    controller = controller or OptionController()
+    controller.active_option = None
+    start = ws.agent_pos
+    duration, cost = 0, 0.0
+
+    if cache is not None and option.deterministic:
+        m = controller.run_macro(env, ws, option, cache, world)
+        s = replace(ws, agent_pos=start)
+        for a, pos in zip(m.actions, m.positions):
+            cost += step_cost(s, a)
+            s.agent_pos = pos
+        duration = len(m.actions)
+        # a diverged replay stops early: finish the option step by step
+        max_steps = 0 if option.termination(ws) else max_steps - duration
+
+    for _ in range(max_steps):
+        action = controller.step(ws, option)
+        if controller.active_option is None:
+            break
+        cost += step_cost(ws, action)
+        ws.agent_pos = env.step(action)
+        duration += 1
+    controller.active_option = None
+
+    if model is not None:
+        model.update(option.name, start, ws.agent_pos, duration, cost)
+    return OptionOutcome(option.name, start, ws.agent_pos, duration, cost)
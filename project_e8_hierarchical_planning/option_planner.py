@@ -11,24 +11,79 @@ Later versions can use:
 - cost models
 - uncertainty
 - learned option outcomes
+
+Both selectors accept an OptionIndex, which answers "which options apply
+here" from per-cell bitsets instead of calling every initiation closure.
+
+choose_option_by_model compares applicable options using a learned
+OptionModel: each candidate is scored by option-level rollouts that jump
+between sampled termination states.
 """
 
-from typing import List
+from dataclasses import replace
+from typing import Callable, List, Optional
+import random
+
 from option import Option
+from option_model import OptionModel
+from option_index import OptionIndex
 
 
-def choose_option(ws, options: List[Option]) -> Option:
+def choose_option(ws, options: List[Option], index: Optional[OptionIndex] = None) -> Option:
     """
     Chooses an applicable option for the current state.
 
     Parameters:
         ws: current world state
         options: list of available options
+        index: optional OptionIndex built over the same options
 
     Returns:
         An Option instance or None if no option is applicable.
     """
+    if index is not None:
+        return index.first_applicable(ws)
     for opt in options:
         if opt.initiation(ws):
             return opt
     return None
+
+
+def choose_option_by_model(
+    ws,
+    options: List[Option],
+    model: OptionModel,
+    value: Callable[[object], float],
+    depth: int = 3,
+    n_rollouts: int = 8,
+    rng: Optional[random.Random] = None,
+    index: Optional[OptionIndex] = None,
+) -> Optional[Option]:
+    """
+    Chooses the applicable option with the best estimated return.
+
+    return = value(final state) - accumulated cost, averaged over
+    n_rollouts option-level rollouts of up to `depth` options (the first
+    being the candidate, later ones picked by choose_option).
+
+    Options never executed from this state are returned first, so the
+    model gets data for them.
+    """
+    best, best_score = None, float("-inf")
+    candidates = index.applicable(ws) if index is not None else [o for o in options if o.initiation(ws)]
+    for opt in candidates:
+        if model.count(opt.name, ws.agent_pos) == 0:
+            return opt
+
+        total = 0.0
+        for _ in range(n_rollouts):
+            traj = model.rollout(
+                ws, options, lambda s, opts: choose_option(s, opts, index), depth, rng, first=opt
+            )
+            end = replace(ws, agent_pos=traj[-1].end) if traj else ws
+            total += value(end) - sum(o.cost for o in traj)
+
+        score = total / n_rollouts
+        if score > best_score:
+            best, best_score = opt, score
+    return best
@@ -1,11 +1,41 @@
 """
 Sanity Tests (Project E8)
 
-Validates that basic option termination logic behaves as expected.
+Validates:
+- basic option termination logic
+- environment snapshot / restore
+- learned option models: outcome statistics and model-based selection
+- option index: bitset lookups agree with scanning initiation closures
+- macro cache: replay matches stepwise execution, invalidates on map changes,
+  follows custom action spaces and keeps worlds sharing a cache apart;
+  a diverged replay still runs the option to termination
+- batch controller: same actions and terminations as per-agent controllers
+- hierarchical planner: finds a path exactly when one exists, its options
+  reach the goal, and replanning after an update avoids new obstacles
+- hierarchical planner: starts on entrance cells keep their graph edges
+- option discovery: a repeated logged detour becomes an executable option,
+  also when read from E5 experience records
 """
 
+import random
+from collections import deque
+
+import numpy as np
+
+from env_gridworld import GridworldEnv
 from state_adapter import WorldState
-from option_library import navigate_right_option
+from option_library import navigate_right_option, navigate_up_option
+from option_model import OptionModel, execute_option
+from option import Option
+from option_index import OptionIndex
+from option_planner import choose_option, choose_option_by_model
+from macro_cache import MacroCache, env_step_fn
+from controller import OptionController
+from batch_controller import BatchOptionController
+from action_space import ActionSpace, action_id, action_delta
+from hierarchical_planner import HierarchicalPlanner
+from option_discovery import mine_skills, discover_options, episodes_from_experience
+from experience import Experience
 
 
 def test_option_termination():
@@ -14,6 +44,313 @@ def test_option_termination():
     assert opt.termination(ws)
 
 
+def test_env_snapshot_restore():
+    env = GridworldEnv(width=5, height=5, agent_pos=(1, 1))
+    token = env.snapshot()
+    for _ in range(3):
+        env.step("right")
+    assert env.agent_pos == (4, 1)
+    env.restore(token)
+    assert env.agent_pos == (1, 1) and env.step("down") == (1, 2)
+
+
+def test_option_model_learns_outcomes():
+    model = OptionModel()
+    right = navigate_right_option(grid_width=5)
+    up = navigate_up_option()
+
+    env = GridworldEnv(width=5, height=5, agent_pos=(0, 4))
+    ws = WorldState(grid_size=(5, 5), agent_pos=(0, 4))
+    out = execute_option(env, ws, right, model)
+    assert out.end == (4, 4) and out.duration == 4 and ws.agent_pos == (4, 4)
+
+    env.agent_pos = ws.agent_pos = (0, 4)
+    execute_option(env, ws, up, model)
+    exp = model.expected("navigate_up", (0, 4))
+    assert exp["termination"] == {(0, 0): 1.0} and exp["duration"] == 4.0
+
+    # option-level rollout: right then up, two jumps instead of eight steps
+    ws = WorldState(grid_size=(5, 5), agent_pos=(0, 4))
+    env.agent_pos = (4, 4)
+    execute_option(env, WorldState((5, 5), (4, 4)), up, model)
+    traj = model.rollout(ws, [up, right], lambda s, o: up if up.initiation(s) else None, 2, first=right)
+    assert [o.end for o in traj] == [(4, 4), (4, 0)]
+
+    # prefer the skill that ends nearer the goal at (4, 0)
+    value = lambda s: -10.0 * (abs(s.agent_pos[0] - 4) + abs(s.agent_pos[1]))
+    best = choose_option_by_model(ws, [up, right], model, value, depth=2, rng=random.Random(0))
+    assert best.name == "navigate_right"
+
+
+def test_option_index_matches_scan():
+    diag = Option("diag", lambda ws: ws.agent_pos[0] == ws.agent_pos[1], lambda ws: "stay", lambda ws: True, positional=True)
+    dynamic = Option("odd_step", lambda ws: ws.agent_pos[0] == 2, lambda ws: "stay", lambda ws: True)
+    options = [diag, navigate_up_option(), navigate_right_option(grid_width=5), dynamic]
+    index = OptionIndex(options, grid_size=(5, 5))
+
+    for _ in range(2):
+        for y in range(5):
+            for x in range(5):
+                ws = WorldState(grid_size=(5, 5), agent_pos=(x, y))
+                assert index.applicable(ws) == [o for o in options if o.initiation(ws)]
+                assert choose_option(ws, options, index) is choose_option(ws, options)
+
+    # positional closures are memoized per cell (25 calls); dynamic ones run
+    # on every lookup (100 calls); masked options never call closures
+    assert index.closure_calls == 25 + 100
+
+
+def test_macro_cache_replay_and_invalidation():
+    calls = []
+    base = navigate_right_option(grid_width=5)
+    right = Option(
+        base.name,
+        base.initiation,
+        lambda ws: calls.append(ws.agent_pos) or base.policy(ws),
+        base.termination,
+        deterministic=True,
+    )
+    cache = MacroCache()
+
+    env = GridworldEnv(width=5, height=5, agent_pos=(1, 2))
+    ws = WorldState(grid_size=(5, 5), agent_pos=(1, 2))
+    stepwise = execute_option(env, ws, right)
+
+    env.agent_pos = ws.agent_pos = (1, 2)
+    first = execute_option(env, ws, right, cache=cache)
+    n_calls = len(calls)
+    env.agent_pos = ws.agent_pos = (1, 2)
+    again = execute_option(env, ws, right, cache=cache)
+
+    assert first == again == stepwise and ws.agent_pos == (4, 2)
+    assert len(calls) == n_calls and cache.hits == 1
+
+    # planners can skip over the option in one lookup
+    m = cache.lookup(right, WorldState((5, 5), (1, 2)), env_step_fn(env))
+    assert m.end == (4, 2) and m.actions == ["right"] * 3
+
+    assert cache.invalidate_cells([(3, 2)]) == 1
+    assert cache.get(right, (1, 2)) is None
+    env.agent_pos = ws.agent_pos = (1, 2)
+    assert OptionController().run_macro(env, ws, right, cache).end == (4, 2)
+
+
+class _DoorEnv(GridworldEnv):
+    """Blocks the move from x=2 to x=3 while door["closed"] > 0."""
+
+    def __init__(self, door, **kwargs):
+        super().__init__(**kwargs)
+        self.door = door
+
+    def step(self, action):
+        if self.door["closed"] > 0 and self.agent_pos[0] == 2 and action == "right":
+            self.door["closed"] -= 1
+            return self.agent_pos
+        return super().step(action)
+
+
+def test_macro_divergence_finishes_option():
+    base = navigate_right_option(grid_width=5)
+    right = Option(base.name, base.initiation, base.policy, base.termination, deterministic=True)
+    door = {"closed": 0}
+    env = _DoorEnv(door, width=5, height=5, agent_pos=(0, 2))
+    model, cache = OptionModel(), MacroCache()
+
+    ws = WorldState((5, 5), (0, 2))
+    assert execute_option(env, ws, right, model, cache=cache).end == (4, 2)
+
+    # the door closes once: replay diverges at (2, 2), stepping takes over
+    door["closed"] = 1
+    env.agent_pos = ws.agent_pos = (0, 2)
+    out = execute_option(env, ws, right, model, cache=cache)
+    assert out.end == (4, 2) and out.duration == 5 and right.termination(ws)
+    assert model.expected(right.name, (0, 2))["termination"] == {(4, 2): 1.0}
+    assert cache.get(right, (0, 2)) is None
+
+
+def test_macro_cache_custom_space_and_worlds():
+    # "right" moves diagonally here; its dependency cells follow this space
+    space = ActionSpace(["right", "stay"], [(1, 1), (0, 0)])
+    diag = Option(
+        "diag",
+        lambda ws: True,
+        lambda ws: "right",
+        lambda ws: ws.agent_pos[0] >= 2,
+        deterministic=True,
+    )
+    cache = MacroCache(action_space=space)
+    env = GridworldEnv(width=5, height=5, agent_pos=(0, 0), action_space=space)
+    m = cache.lookup(diag, WorldState((5, 5), (0, 0)), env_step_fn(env))
+    assert m.positions == [(1, 1), (2, 2)]
+    assert cache.invalidate_cells([(1, 0)]) == 0
+    assert cache.invalidate_cells([(1, 1)]) == 1
+
+    # one cache shared by two worlds keeps their trajectories apart
+    small = GridworldEnv(width=3, height=5, agent_pos=(0, 2))
+    wide = GridworldEnv(width=5, height=5, agent_pos=(0, 2))
+    right = navigate_right_option(grid_width=5)
+    right.deterministic = True
+    cache = MacroCache()
+    ws = WorldState((3, 5), (0, 2))
+    assert cache.lookup(right, ws, env_step_fn(small), world="small").end == (2, 2)
+    assert cache.get(right, (0, 2), world="wide") is None
+    assert cache.lookup(right, ws, env_step_fn(wide), world="wide").end == (4, 2)
+
+
+def test_batch_controller_matches_single():
+    up, right = navigate_up_option(), navigate_right_option(grid_width=5)
+    # a closure-only copy exercises the per-agent fallback
+    slow_up = Option("slow_up", up.initiation, up.policy, up.termination)
+    options = [up, right, slow_up]
+
+    rng = np.random.default_rng(0)
+    n = 40
+    positions = rng.integers(0, 5, size=(n, 2))
+    chosen = rng.integers(-1, len(options), size=n)
+
+    batch = BatchOptionController(options, n, grid_size=(5, 5))
+    singles = [OptionController() for _ in range(n)]
+    for _ in range(6):
+        actions = batch.step(positions, chosen)
+        for i, ctl in enumerate(singles):
+            ws = WorldState((5, 5), tuple(int(v) for v in positions[i]))
+            if chosen[i] >= 0 or ctl.active_option is not None:
+                assert actions[i] == action_id(ctl.step(ws, options[chosen[i]]))
+            else:
+                assert actions[i] == action_id("stay")
+            active = -1 if ctl.active_option is None else options.index(ctl.active_option)
+            assert batch.active[i] == active
+        positions = positions + np.array([(0, -1), (0, 1), (-1, 0), (1, 0), (0, 0)])[actions]
+        positions = np.clip(positions, 0, 4)
+
+
+def _reachable(blocked, start, goal):
+    h, w = blocked.shape
+    seen, q = {start}, deque([start])
+    while q:
+        x, y = q.popleft()
+        for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+            n = (x + dx, y + dy)
+            if 0 <= n[0] < w and 0 <= n[1] < h and n not in seen and not blocked[n[1], n[0]]:
+                seen.add(n)
+                q.append(n)
+    return goal in seen
+
+
+def _run_options(options, start, blocked):
+    ws, cells = WorldState(grid_size=blocked.shape[::-1], agent_pos=start), [start]
+    for opt in options:
+        assert opt.initiation(ws)
+        while not opt.termination(ws):
+            dx, dy = action_delta(opt.policy(ws))
+            ws.agent_pos = (ws.agent_pos[0] + dx, ws.agent_pos[1] + dy)
+            assert not blocked[ws.agent_pos[1], ws.agent_pos[0]]
+            cells.append(ws.agent_pos)
+    return cells
+
+
+def test_hierarchical_planner():
+    rng = np.random.default_rng(3)
+    blocked = rng.random((30, 40)) < 0.3
+    planner = HierarchicalPlanner(blocked, cluster_size=8)
+
+    free = [(x, y) for y in range(30) for x in range(40) if not blocked[y, x]]
+    for _ in range(40):
+        s, g = (free[i] for i in rng.choice(len(free), 2))
+        options = planner.plan_options(s, g)
+        assert (options is not None) == _reachable(blocked, s, g)
+        if options is not None:
+            assert _run_options(options, s, blocked)[-1] == g
+
+    open_map = np.zeros((24, 24), dtype=bool)
+    planner = HierarchicalPlanner(open_map, cluster_size=6)
+    cells = _run_options(planner.plan_options((0, 0), (23, 23)), (0, 0), open_map)
+    assert len(cells) - 1 == 46
+
+    wall = cells[len(cells) // 2]
+    open_map[wall[1], wall[0]] = True
+    planner.update([wall])
+    assert wall not in _run_options(planner.plan_options((0, 0), (23, 23)), (0, 0), open_map)
+
+
+def test_hierarchical_planner_start_on_entrance():
+    # single crossing at row 0; the start is that crossing's entrance cell
+    blocked = np.zeros((4, 8), dtype=bool)
+    blocked[1:, 3] = True
+    planner = HierarchicalPlanner(blocked, cluster_size=4)
+    assert (3, 0) in planner.inter
+    options = planner.plan_options((3, 0), (6, 2))
+    assert options is not None
+    assert _run_options(options, (3, 0), blocked)[-1] == (6, 2)
+
+    rng = np.random.default_rng(5)
+    blocked = rng.random((24, 24)) < 0.35
+    planner = HierarchicalPlanner(blocked, cluster_size=6)
+    nodes = sorted(planner.inter)
+    free = [(x, y) for y in range(24) for x in range(24) if not blocked[y, x]]
+    for _ in range(100):
+        s, g = nodes[rng.integers(len(nodes))], free[rng.integers(len(free))]
+        assert (planner.plan(s, g) is not None) == _reachable(blocked, s, g)
+
+
+SKILL = ["right", "right", "down", "down", "right"]
+
+
+def _logged_episodes():
+    rng = random.Random(0)
+    episodes = []
+    for start in [(0, 0), (0, 10), (10, 0), (10, 10)]:
+        pos, ep = start, []
+        # random noise, then the recurring skill ending on a reward
+        for a in [rng.choice(["up", "left", "stay"]) for _ in range(3)] + SKILL:
+            dx, dy = action_delta(a)
+            nxt = (min(19, max(0, pos[0] + dx)), min(19, max(0, pos[1] + dy)))
+            ep.append((pos, a, nxt, 0.0))
+            pos = nxt
+        ep[-1] = ep[-1][:3] + (1.0,)
+        episodes.append(ep)
+    return episodes
+
+
+def test_option_discovery_from_logs():
+    episodes = _logged_episodes()
+    best = mine_skills(episodes, min_len=3, max_len=6, min_support=3, top_k=1)[0]
+    assert best.actions == tuple(SKILL) and best.support == 4 and best.mean_return == 1.0
+
+    opt = discover_options(episodes, (20, 20), min_len=3, max_len=6, min_support=3, top_k=1)[0]
+    index = OptionIndex([opt], grid_size=(20, 20))
+    for ep in episodes:
+        start = ep[3][0]
+        assert index.first_applicable(WorldState((20, 20), start)) is opt
+        cells = _run_options([opt], start, np.zeros((20, 20), dtype=bool))
+        assert cells[-1] == ep[-1][2] and len(cells) == len(SKILL) + 1
+
+
+def test_option_discovery_from_experience_records():
+    # records as E5's pipeline logs them, one timeline with gaps between episodes
+    episodes = _logged_episodes()
+    records = []
+    for e, ep in enumerate(episodes):
+        for i, (pos, a, nxt, r) in enumerate(ep):
+            meta = {"belief_reward": 0.0, "real_reward": r}
+            records.append(Experience(100 * e + i, pos, a, pos, nxt, 0.0, meta))
+
+    assert episodes_from_experience(records) == episodes
+    best = mine_skills(episodes_from_experience(records), min_len=3, max_len=6, min_support=3, top_k=1)[0]
+    assert best.actions == tuple(SKILL) and best.mean_return == 1.0
+
+
 if __name__ == "__main__":
     test_option_termination()
+    test_env_snapshot_restore()
+    test_option_model_learns_outcomes()
+    test_option_index_matches_scan()
+    test_macro_cache_replay_and_invalidation()
+    test_macro_divergence_finishes_option()
+    test_macro_cache_custom_space_and_worlds()
+    test_batch_controller_matches_single()
+    test_hierarchical_planner()
+    test_hierarchical_planner_start_on_entrance()
+    test_option_discovery_from_logs()
+    test_option_discovery_from_experience_records()
     print("✅ tests passed")